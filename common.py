@@ -1,3 +1,4 @@
+import numpy as np
 import matplotlib.pyplot as plt
 from typing import List, Tuple
 
@@ -56,6 +57,53 @@ def record_positions(actions: List[int], pos_list: List[Tuple[float, float]]) ->
     return recorded_positions
 
 
+def record_positions_array(actions: List[int], pos_list: List[Tuple[float, float]]) -> np.ndarray:
+    """
+    record_positions() 的数组版本：以相邻动作的差异一次找出全部变化点。
+
+    :param actions: 动作列表
+    :param pos_list: 位置列表，每个元素是一个包含两个元素的元组 (x, y)
+    :return: 记录的位置，(N, 2) 的 [x, y] 数组
+    """
+    actions = np.asarray(actions)
+    if not len(actions):
+        return np.empty((0, 2), dtype=np.float64)
+    positions = np.asarray(pos_list, dtype=np.float64)
+    assert positions.ndim == 2 and positions.shape[1] >= 2, "位置列表的每个元素应为包含两个元素的元组"
+    # 与 record_positions() 相同：记录第 0 个位置，以及动作与前一帧不同的第 k 帧位置（1 <= k <= n - 2）
+    changed = np.flatnonzero(actions[1:-1] != actions[:-2]) + 1
+    return positions[np.concatenate(([0], changed)), :2]
+
+
+def batch_pixel_to_meter_array(positions_p, pixels_per_meter: float, swap_axes: bool = False) -> np.ndarray:
+    """
+    batch_pixel_to_meter() 的数组版本。
+
+    :param positions_p: 像素位置，(N, 2) 的 [x_p, y_p] 数组或元组列表
+    :param pixels_per_meter: 比例尺
+    :param swap_axes: 是否互换 x 和 y 坐标
+    :return: 转换后的物理位置，连续存储的 (N, 2) 数组
+    """
+    positions = np.asarray(positions_p, dtype=np.float64).reshape(-1, 2)
+    if swap_axes:
+        positions = positions[:, ::-1]
+    return np.ascontiguousarray(positions * pixels_per_meter)
+
+
+def record_physical_positions(actions: List[int], pos_list: List[Tuple[float, float]], pixels_per_meter: float,
+                              swap_axes: bool = True) -> np.ndarray:
+    """
+    根据动作变化记录位置并转换为物理位置（米），可直接用于 GeoConverter 的 _array 换算。
+
+    :param actions: 动作列表
+    :param pos_list: 像素位置列表，每个元素是一个包含两个元素的元组 (x, y)
+    :param pixels_per_meter: 比例尺
+    :param swap_axes: 是否互换 x 和 y 坐标
+    :return: 连续存储的 (N, 2) 物理位置数组
+    """
+    return batch_pixel_to_meter_array(record_positions_array(actions, pos_list), pixels_per_meter, swap_axes)
+
+
 def _plot_positions(recorded_positions: List[Tuple[float, float]], title: str, invert_y: bool = False):
     """
     绘制位置散点图。
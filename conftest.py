@@ -0,0 +1 @@
+# 使 tests/ 中的用例可以直接导入仓库根目录下的包
@@ -1,6 +1,12 @@
+import math
+import threading
+import numpy as np
+from collections import OrderedDict
+from dataclasses import dataclass
 from typing import List, Tuple
 from geopy import Point
 from geopy.distance import geodesic
+from pyproj import Geod
 class RectangularTaskArea:
     bottom_longitude: float = 122.745196
     bottom_latitude: float = 30.796787
@@ -8,24 +14,205 @@ class RectangularTaskArea:
     top_latitude: float = 30.814828
 
 
+class LocalProjection:
+    def __init__(self, ge_od: Geod, origin: Point, task_area, north_positive: bool):
+        """
+        任务区域内的等距圆柱投影：x 只与经度差有关、y 只与纬度差有关，均取线性比例。
+        米转经纬度时另计东西向测地线向赤道一侧的偏移 x²·tanφ/(2N)（与 GeoConverter 先东西、后南北的两步换算一致）。
+
+        比例系数按任务区域宽、高两端的测地线距离取割线值，与 GeoConverter 的两步测地线换算在区域边界处一致，
+        区域内误差见 GeoConverter.validate_projection()。
+
+        :param ge_od: pyproj Geod
+        :param origin: 原点
+        :param task_area: 矩形任务区域对象
+        :param north_positive: y 是否以北为正
+        """
+        self.latitude = origin.latitude
+        self.longitude = origin.longitude
+        width = task_area.top_longitude - task_area.bottom_longitude
+        height = task_area.top_latitude - task_area.bottom_latitude
+        assert width > 0 and height > 0, "任务区域的宽、高必须大于 0"
+        # 东西方向沿原点纬度量取，南北方向为子午线弧长（与经度无关）
+        _, _, x_distance = ge_od.inv(origin.longitude, origin.latitude, origin.longitude + width, origin.latitude)
+        _, _, y_distance = ge_od.inv(origin.longitude, task_area.bottom_latitude,
+                                     origin.longitude, task_area.top_latitude)
+        self.x_scale = x_distance / width                                          # 单位: m/°
+        self.y_scale = y_distance / height if north_positive else -y_distance / height
+        sin_phi = math.sin(math.radians(origin.latitude))
+        prime_vertical = ge_od.a / math.sqrt(1 - ge_od.es * sin_phi * sin_phi)
+        self.drift = math.tan(math.radians(origin.latitude)) / (2 * prime_vertical) / abs(self.y_scale)  # 单位: °/m²
+
+    def to_meters(self, latitude: float, longitude: float) -> Tuple[float, float]:
+        return (longitude - self.longitude) * self.x_scale, (latitude - self.latitude) * self.y_scale
+
+    def to_latlon(self, x_m: float, y_m: float) -> Tuple[float, float]:
+        return self.latitude + y_m / self.y_scale - x_m * x_m * self.drift, self.longitude + x_m / self.x_scale
+
+    def to_meters_array(self, coordinates) -> np.ndarray:
+        # (N, 2) [纬度, 经度] -> (N, 2) [x_m, y_m]
+        coordinates = np.asarray(coordinates, dtype=np.float64).reshape(-1, 2)
+        return np.column_stack(((coordinates[:, 1] - self.longitude) * self.x_scale,
+                                (coordinates[:, 0] - self.latitude) * self.y_scale))
+
+    def to_latlon_array(self, coordinates) -> np.ndarray:
+        # (N, 2) [x_m, y_m] -> (N, 2) [纬度, 经度]
+        coordinates = np.asarray(coordinates, dtype=np.float64).reshape(-1, 2)
+        x_m = coordinates[:, 0]
+        return np.column_stack((self.latitude + coordinates[:, 1] / self.y_scale - x_m * x_m * self.drift,
+                                self.longitude + coordinates[:, 0] / self.x_scale))
+
+
+@dataclass
+class ConversionCacheStats:
+    hits: int = 0           # 命中次数
+    misses: int = 0         # 未命中次数
+    evictions: int = 0      # 超出容量被淘汰的条目数
+    invalidations: int = 0  # 整体失效次数
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+class ConversionCache:
+    # 约 1° 纬度对应的距离，用于把米制分辨率换算为经纬度分辨率，单位: m
+    METERS_PER_DEGREE = 111320.0
+
+    def __init__(self, max_size: int = 4096, resolution: float = 1e-4):
+        """
+        坐标换算结果的 LRU 缓存，键为 (换算类型, 原点, 量化后的输入)，超出容量时淘汰最久未使用的条目。
+
+        输入按 resolution 量化，同一量化格内的输入共用首次换算的结果，与直接换算相差不超过 resolution 量级；
+        完全相同的输入结果与直接换算一致。
+
+        :param max_size: 最多保存的条目数
+        :param resolution: 输入量化分辨率，单位: m（经纬度输入按 1° ≈ 111 km 换算）
+        """
+        assert max_size > 0, "缓存容量必须大于 0"
+        assert resolution > 0, "量化分辨率必须大于 0"
+        self.max_size = max_size
+        self.resolution = resolution
+        self._degree_resolution = resolution / self.METERS_PER_DEGREE
+        self.stats = ConversionCacheStats()
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def key(self, kind: str, origin: Point, a: float, b: float, degrees: bool) -> tuple:
+        resolution = self._degree_resolution if degrees else self.resolution
+        return kind, origin.latitude, origin.longitude, round(a / resolution), round(b / resolution)
+
+    def array_key(self, kind: str, origin: Point, coordinates: np.ndarray, degrees: bool) -> tuple:
+        # 整个 (N, 2) 输入数组作为一个条目，量化后按字节比较
+        resolution = self._degree_resolution if degrees else self.resolution
+        quantized = np.round(coordinates / resolution).astype(np.int64)
+        return kind, origin.latitude, origin.longitude, quantized.shape, quantized.tobytes()
+
+    def get(self, key: tuple):
+        with self._lock:
+            value = self._entries.get(key)
+            if value is None:
+                self.stats.misses += 1
+            else:
+                self._entries.move_to_end(key)
+                self.stats.hits += 1
+            return value
+
+    def put(self, key: tuple, value):
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            if len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.stats.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.stats.invalidations += 1
+
+
 class GeoConverter:
-    def __init__(self, task_area):
+    def __init__(self, task_area, fast_projection: bool = False, cache_size: int = 0, cache_resolution: float = 1e-4):
         """
         初始化矩形任务区域，设置左上角和左下角为原点。
 
         :param task_area: 矩形任务区域对象
+        :param fast_projection: True 时使用预先计算的局部投影代替测地线计算，
+                                误差见 validate_projection()，也可用 enable_fast_projection() 按容差开启
+        :param cache_size: LRU 缓存容量，0 为不缓存；标量换算（含 _list 版本）每个点一个条目，
+                           _array 版本每个输入数组一个条目（重复加载同一航线时整体命中）
+        :param cache_resolution: 缓存键的输入量化分辨率，单位: m
         """
+        self.ge_od = Geod(ellps='WGS84')  # 数组版本使用 pyproj 的向量化测地线计算
+        self.fast_projection = fast_projection
+        self.cache = None
+        self.set_task_area(task_area)
+        if cache_size > 0:
+            self.cache = ConversionCache(cache_size, cache_resolution)
+
+    def set_task_area(self, task_area):
+        """
+        更换任务区域：重新设置原点与局部投影，并清空换算缓存。
+
+        :param task_area: 矩形任务区域对象
+        """
+        self.task_area = task_area
         self.top_left_origin: Point = Point(task_area.top_latitude, task_area.bottom_longitude)
         self.bottom_left_origin: Point = Point(task_area.bottom_latitude, task_area.bottom_longitude)
-
-    def meters_to_latlon_scatter(self, x_m: float, y_m: float) -> Point:
+        self.scatter_projection = LocalProjection(self.ge_od, self.top_left_origin, task_area, north_positive=False)
+        self.continuous_projection = LocalProjection(self.ge_od, self.bottom_left_origin, task_area,
+                                                     north_positive=True)
+        self.invalidate_cache()
+
+    def invalidate_cache(self):
+        if self.cache is not None:
+            self.cache.clear()
+
+    def _cached(self, kind: str, origin: Point, a: float, b: float, degrees: bool, cache: bool, compute, *args):
+        # 查询缓存，未命中时调用 compute(*args) 并保存结果
+        if self.cache is None or not cache:
+            return compute(*args)
+        key = self.cache.key(kind, origin, a, b, degrees)
+        value = self.cache.get(key)
+        if value is None:
+            value = compute(*args)
+            self.cache.put(key, value)
+        return value
+
+    def _cached_array(self, kind: str, origin: Point, coordinates, degrees: bool, compute, north_positive: bool):
+        # _array 版本的缓存：以整个输入数组为键，返回结果的副本，避免调用方修改缓存内容
+        coordinates = np.asarray(coordinates, dtype=np.float64).reshape(-1, 2)
+        if self.cache is None:
+            return compute(origin, coordinates, north_positive)
+        key = self.cache.array_key(kind, origin, coordinates, degrees)
+        value = self.cache.get(key)
+        if value is None:
+            value = compute(origin, coordinates, north_positive)
+            value.setflags(write=False)
+            self.cache.put(key, value)
+        return value.copy()
+
+    def meters_to_latlon_scatter(self, x_m: float, y_m: float, cache: bool = True) -> Point:
         """
         将物理距离 (x_m, y_m) 转换为经纬度坐标，以左上角为原点。
 
         :param x_m: 东向距离（米，正为东，负为西）
         :param y_m: 南向距离（米，正为南，负为北）
+        :param cache: 是否使用换算缓存
         :return: 经纬度坐标点对象
         """
+        if self.fast_projection:
+            return Point(*self.scatter_projection.to_latlon(x_m, y_m))
+        # 缓存中的 Point 不直接返回，避免调用方修改
+        return Point(self._cached('meters_to_latlon_scatter', self.top_left_origin, x_m, y_m, False, cache,
+                                  self._meters_to_latlon_scatter, x_m, y_m))
+
+    def _meters_to_latlon_scatter(self, x_m: float, y_m: float) -> Point:
         x_bearing = 90.0 if x_m >= 0 else 270.0
         x_distance_km = abs(x_m) / 1000.0
         intermediate_point = geodesic(kilometers=x_distance_km).destination(self.top_left_origin, bearing=x_bearing)
@@ -45,14 +232,21 @@ class GeoConverter:
         """
         return [self.meters_to_latlon_scatter(x_m, y_m) for x_m, y_m in coord_list]
 
-    def meters_to_latlon_continuous(self, x_m: float, y_m: float) -> Point:
+    def meters_to_latlon_continuous(self, x_m: float, y_m: float, cache: bool = True) -> Point:
         """
         将物理距离 (x_m, y_m) 转换为经纬度坐标，以左下角为原点。
 
         :param x_m: 东向距离（米，正为东，负为西）
         :param y_m: 北向距离（米，正为北，负为南）
+        :param cache: 是否使用换算缓存
         :return: 经纬度坐标点对象
         """
+        if self.fast_projection:
+            return Point(*self.continuous_projection.to_latlon(x_m, y_m))
+        return Point(self._cached('meters_to_latlon_continuous', self.bottom_left_origin, x_m, y_m, False, cache,
+                                  self._meters_to_latlon_continuous, x_m, y_m))
+
+    def _meters_to_latlon_continuous(self, x_m: float, y_m: float) -> Point:
         x_bearing = 90.0 if x_m >= 0 else 270.0
         x_distance_km = abs(x_m) / 1000.0
         intermediate_point = geodesic(kilometers=x_distance_km).destination(self.bottom_left_origin, bearing=x_bearing)
@@ -72,13 +266,20 @@ class GeoConverter:
         """
         return [self.meters_to_latlon_continuous(x_m, y_m) for x_m, y_m in coord_list]
 
-    def latlon_to_meters_scatter(self, target: Point) -> Tuple[float, float]:
+    def latlon_to_meters_scatter(self, target: Point, cache: bool = True) -> Tuple[float, float]:
         """
         将经纬度坐标转换为以左上角为原点的物理距离 (x_m, y_m)。
 
         :param target: 目标点经纬度
+        :param cache: 是否使用换算缓存
         :return: (x_m, y_m)（米，东向正为东，南向正为南）
         """
+        if self.fast_projection:
+            return self.scatter_projection.to_meters(target.latitude, target.longitude)
+        return self._cached('latlon_to_meters_scatter', self.top_left_origin, target.latitude, target.longitude,
+                            True, cache, self._latlon_to_meters_scatter, target)
+
+    def _latlon_to_meters_scatter(self, target: Point) -> Tuple[float, float]:
         intermediate_point = Point(self.top_left_origin.latitude, target.longitude)
         x_distance_km = geodesic(self.top_left_origin, intermediate_point).kilometers
         x_m = x_distance_km * 1000.0
@@ -99,13 +300,20 @@ class GeoConverter:
         """
         return [self.latlon_to_meters_scatter(target) for target in target_list]
 
-    def latlon_to_meters_continuous(self, target: Point) -> Tuple[float, float]:
+    def latlon_to_meters_continuous(self, target: Point, cache: bool = True) -> Tuple[float, float]:
         """
         将经纬度坐标转换为以左下角为原点的物理距离 (x_m, y_m)。
 
         :param target: 目标点经纬度
+        :param cache: 是否使用换算缓存
         :return: (x_m, y_m)（米，东向正为东，北向正为北）
         """
+        if self.fast_projection:
+            return self.continuous_projection.to_meters(target.latitude, target.longitude)
+        return self._cached('latlon_to_meters_continuous', self.bottom_left_origin, target.latitude,
+                            target.longitude, True, cache, self._latlon_to_meters_continuous, target)
+
+    def _latlon_to_meters_continuous(self, target: Point) -> Tuple[float, float]:
         intermediate_point = Point(self.bottom_left_origin.latitude, target.longitude)
         x_distance_km = geodesic(self.bottom_left_origin, intermediate_point).kilometers
         x_m = x_distance_km * 1000.0
@@ -126,6 +334,191 @@ class GeoConverter:
         """
         return [self.latlon_to_meters_continuous(target) for target in target_list]
 
+    def _meters_to_latlon_array(self, origin: Point, coordinates, north_positive: bool) -> np.ndarray:
+        # 先沿东西方向、再沿南北方向走测地线，与标量版本的两步 geodesic().destination() 相同
+        coordinates = np.asarray(coordinates, dtype=np.float64).reshape(-1, 2)
+        x_m = coordinates[:, 0]
+        y_m = coordinates[:, 1]
+        size = len(coordinates)
+        x_bearing = np.where(x_m >= 0, 90.0, 270.0)
+        lon, lat, _ = self.ge_od.fwd(np.full(size, origin.longitude), np.full(size, origin.latitude),
+                                     x_bearing, np.abs(x_m))
+        north = y_m >= 0 if north_positive else y_m < 0
+        y_bearing = np.where(north, 0.0, 180.0)
+        lon, lat, _ = self.ge_od.fwd(lon, lat, y_bearing, np.abs(y_m))
+        return np.column_stack((lat, lon))
+
+    def _latlon_to_meters_array(self, origin: Point, coordinates, north_positive: bool) -> np.ndarray:
+        # 经由 (原点纬度, 目标经度) 的中间点分别求东西、南北方向的测地线距离，与标量版本相同
+        coordinates = np.asarray(coordinates, dtype=np.float64).reshape(-1, 2)
+        latitude = coordinates[:, 0]
+        longitude = coordinates[:, 1]
+        size = len(coordinates)
+        origin_lat = np.full(size, origin.latitude)
+        _, _, x_m = self.ge_od.inv(np.full(size, origin.longitude), origin_lat, longitude, origin_lat)
+        x_m = np.where(longitude >= origin.longitude, x_m, -x_m)
+        _, _, y_m = self.ge_od.inv(longitude, origin_lat, longitude, latitude)
+        north = latitude >= origin.latitude if north_positive else latitude <= origin.latitude
+        y_m = np.where(north, y_m, -y_m)
+        return np.column_stack((x_m, y_m))
+
+    def meters_to_latlon_scatter_array(self, coordinates) -> np.ndarray:
+        """
+        meters_to_latlon_scatter() 的数组版本，以左上角为原点。
+
+        :param coordinates: (N, 2) 的 [x_m, y_m] 数组（东向正为东，南向正为南）
+        :return: (N, 2) 的 [纬度, 经度] 数组
+        """
+        if self.fast_projection:
+            return self.scatter_projection.to_latlon_array(coordinates)
+        return self._cached_array('meters_to_latlon_scatter', self.top_left_origin, coordinates, False, self._meters_to_latlon_array, False)
+
+    def meters_to_latlon_continuous_array(self, coordinates) -> np.ndarray:
+        """
+        meters_to_latlon_continuous() 的数组版本，以左下角为原点。
+
+        :param coordinates: (N, 2) 的 [x_m, y_m] 数组（东向正为东，北向正为北）
+        :return: (N, 2) 的 [纬度, 经度] 数组
+        """
+        if self.fast_projection:
+            return self.continuous_projection.to_latlon_array(coordinates)
+        return self._cached_array('meters_to_latlon_continuous', self.bottom_left_origin, coordinates, False, self._meters_to_latlon_array, True)
+
+    def latlon_to_meters_scatter_array(self, coordinates) -> np.ndarray:
+        """
+        latlon_to_meters_scatter() 的数组版本，以左上角为原点。
+
+        :param coordinates: (N, 2) 的 [纬度, 经度] 数组
+        :return: (N, 2) 的 [x_m, y_m] 数组（东向正为东，南向正为南）
+        """
+        if self.fast_projection:
+            return self.scatter_projection.to_meters_array(coordinates)
+        return self._cached_array('latlon_to_meters_scatter', self.top_left_origin, coordinates, True, self._latlon_to_meters_array, False)
+
+    def latlon_to_meters_continuous_array(self, coordinates) -> np.ndarray:
+        """
+        latlon_to_meters_continuous() 的数组版本，以左下角为原点。
+
+        :param coordinates: (N, 2) 的 [纬度, 经度] 数组
+        :return: (N, 2) 的 [x_m, y_m] 数组（东向正为东，北向正为北）
+        """
+        if self.fast_projection:
+            return self.continuous_projection.to_meters_array(coordinates)
+        return self._cached_array('latlon_to_meters_continuous', self.bottom_left_origin, coordinates, True, self._latlon_to_meters_array, True)
+
+    def validate_projection(self, samples: int = 41, margin: float = 0.0) -> List[Tuple[str, float]]:
+        """
+        以测地线换算为基准，统计局部投影在整个任务区域内的最大误差。
+
+        :param samples: 区域每边均匀取的点数
+        :param margin: 区域向外扩展的比例，如 0.5 表示每边各扩展区域宽/高的一半
+        :return: [(换算名称, 最大误差 m), ...]，经纬度结果的误差取与基准点的测地线距离
+        """
+        area = self.task_area
+        width = area.top_longitude - area.bottom_longitude
+        height = area.top_latitude - area.bottom_latitude
+        latitudes = np.linspace(area.bottom_latitude - margin * height, area.top_latitude + margin * height, samples)
+        longitudes = np.linspace(area.bottom_longitude - margin * width, area.top_longitude + margin * width, samples)
+        latitudes, longitudes = np.meshgrid(latitudes, longitudes)
+        latlon = np.column_stack((latitudes.ravel(), longitudes.ravel()))
+
+        result = []
+        for name, origin, projection, north_positive in (
+                ("scatter", self.top_left_origin, self.scatter_projection, False),
+                ("continuous", self.bottom_left_origin, self.continuous_projection, True)):
+            meters = self._latlon_to_meters_array(origin, latlon, north_positive)
+            meters_error = np.abs(projection.to_meters_array(latlon) - meters).max()
+            expected = self._meters_to_latlon_array(origin, meters, north_positive)
+            projected = projection.to_latlon_array(meters)
+            _, _, distances = self.ge_od.inv(expected[:, 1], expected[:, 0], projected[:, 1], projected[:, 0])
+            result.append((f"latlon_to_meters_{name}", float(meters_error)))
+            result.append((f"meters_to_latlon_{name}", float(np.max(distances))))
+        return result
+
+    def enable_fast_projection(self, tolerance: float = 0.01) -> float:
+        """
+        局部投影在任务区域内的最大误差不超过 tolerance 时开启快速模式。
+
+        :param tolerance: 允许的最大误差，单位: m
+        :return: 最大误差，单位: m
+        """
+        max_error = max(error for _, error in self.validate_projection())
+        self.fast_projection = max_error <= tolerance
+        return max_error
+
+
+def benchmark_converter(sizes=(1000, 100000), scalar_limit: int = 1000):
+    """
+    比较 _list 标量版本与 _array 数组版本的耗时及结果差异。
+
+    :param sizes: 点数
+    :param scalar_limit: 标量版本最多计算的点数，超过时按该点数的耗时线性外推
+    """
+    import time
+
+    converter = GeoConverter(RectangularTaskArea())
+    ge_od = converter.ge_od
+    rng = np.random.default_rng(0)
+    for size in sizes:
+        meters = np.column_stack((rng.uniform(-500, 2500, size), rng.uniform(-500, 2500, size)))
+        latlon = converter.meters_to_latlon_continuous_array(meters)
+        scalar_size = min(size, scalar_limit)
+        cases = (
+            ("meters_to_latlon_scatter", meters, converter.meters_to_latlon_scatter_list,
+             converter.meters_to_latlon_scatter_array, lambda points: [(p.latitude, p.longitude) for p in points]),
+            ("meters_to_latlon_continuous", meters, converter.meters_to_latlon_continuous_list,
+             converter.meters_to_latlon_continuous_array, lambda points: [(p.latitude, p.longitude) for p in points]),
+            ("latlon_to_meters_scatter", latlon, converter.latlon_to_meters_scatter_list,
+             converter.latlon_to_meters_scatter_array, list),
+            ("latlon_to_meters_continuous", latlon, converter.latlon_to_meters_continuous_list,
+             converter.latlon_to_meters_continuous_array, list),
+        )
+        for name, data, scalar, vectorized, unpack in cases:
+            scalar_input = [Point(latitude, longitude) for latitude, longitude in data[:scalar_size]] \
+                if data is latlon else [tuple(row) for row in data[:scalar_size]]
+            start = time.perf_counter()
+            expected = np.array(unpack(scalar(scalar_input)))
+            scalar_time = (time.perf_counter() - start) * size / scalar_size
+            start = time.perf_counter()
+            result = vectorized(data)
+            array_time = time.perf_counter() - start
+
+            if data is latlon:
+                error = np.abs(result[:scalar_size] - expected).max()  # 单位: m
+            else:
+                _, _, distances = ge_od.inv(expected[:, 1], expected[:, 0],
+                                            result[:scalar_size, 1], result[:scalar_size, 0])
+                error = np.max(distances)
+            print(f"{size:>7} points  {name:<28} list {scalar_time * 1000:>10.1f} ms  "
+                  f"array {array_time * 1000:>8.1f} ms  max error {error:.2e} m")
+
+
+def benchmark_cache(points: int = 200, loads: int = 5, cache_size: int = 4096):
+    """
+    重复加载同一航线（meters_to_latlon_scatter_list + latlon_to_meters_continuous_list）时，比较有无缓存的耗时。
+
+    :param points: 航点数
+    :param loads: 加载次数
+    :param cache_size: 缓存容量
+    """
+    import time
+
+    rng = np.random.default_rng(0)
+    waypoints = (rng.integers(0, 100, (points, 2)) * 20.0).tolist()
+    for size in (0, cache_size):
+        converter = GeoConverter(RectangularTaskArea(), cache_size=size)
+        results = []
+        start = time.perf_counter()
+        for _ in range(loads):
+            geographic_positions = converter.meters_to_latlon_scatter_list(waypoints)
+            results.append(converter.latlon_to_meters_continuous_list(geographic_positions))
+        elapsed = time.perf_counter() - start
+        line = f"cache {size:>5}  {loads} loads of {points} waypoints  {elapsed * 1000:>9.1f} ms"
+        if converter.cache is not None:
+            stats = converter.cache.stats
+            line += f"  hits {stats.hits}  misses {stats.misses}  hit rate {stats.hit_rate:.2f}"
+        print(line + f"  identical {all(result == results[0] for result in results)}")
+
 
 def main():
     task_area = RectangularTaskArea()
@@ -161,4 +554,8 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
+    benchmark_converter()
+    benchmark_cache()
+    for name, error in GeoConverter(RectangularTaskArea()).validate_projection(margin=0.5):
+        print(f"{name:<28} projection max error {error * 1000:.3f} mm")
\ No newline at end of file
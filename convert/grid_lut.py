@@ -0,0 +1,193 @@
+import os
+import hashlib
+import numpy as np
+from log.log import logger
+from convert.coordinate_conversion import GeoConverter, RectangularTaskArea
+
+# 默认的查找表缓存目录
+DEFAULT_CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'lut_cache')
+# 查找表格式变化时递增，使旧缓存失效
+_LUT_VERSION = 1
+
+
+class GridLUT:
+    # 进程内已加载的查找表，key 同缓存文件名
+    _loaded = {}
+
+    def __init__(self, task_area, cell_size: float, latlon: np.ndarray, continuous: np.ndarray):
+        """
+        任务区域内规则网格的坐标查找表，网格以左上角为原点（与 scatter 坐标一致），节点 (i, j) 的坐标为
+        (i * cell_size 东, j * cell_size 南)。
+
+        节点上保存测地线换算得到的经纬度与左下角原点坐标，网格内的点由相邻 4 个节点双线性插值，
+        落在节点上的点结果与节点值完全相同；网格外的点按边缘网格线性外推。
+
+        一般通过 GridLUT.open() 获取。
+
+        :param task_area: 矩形任务区域对象
+        :param cell_size: 网格边长，单位: m
+        :param latlon: (nx, ny, 2) 的节点 [纬度, 经度]
+        :param continuous: (nx, ny, 2) 的节点左下角原点坐标 [x_m, y_m]
+        """
+        assert latlon.shape == continuous.shape and latlon.shape[0] >= 2 and latlon.shape[1] >= 2, \
+            "查找表每个方向至少需要 2 个节点"
+        self.task_area = task_area
+        self.cell_size = cell_size
+        self.latlon = latlon
+        self.continuous = continuous
+
+    @staticmethod
+    def cache_key(task_area, cell_size: float) -> str:
+        # 由任务区域参数与网格边长确定的缓存文件名
+        params = (f"v{_LUT_VERSION}_{task_area.bottom_latitude:.9f}_{task_area.bottom_longitude:.9f}_"
+                  f"{task_area.top_latitude:.9f}_{task_area.top_longitude:.9f}_{cell_size:.6f}")
+        return f"grid_lut_{hashlib.sha1(params.encode()).hexdigest()[:16]}.npz"
+
+    @classmethod
+    def build(cls, task_area, cell_size: float):
+        """
+        用测地线换算计算全部节点，网格覆盖整个任务区域（向外取整到整格）。
+        """
+        assert cell_size > 0, "网格边长必须大于 0"
+        converter = GeoConverter(task_area)
+        width, height = converter.latlon_to_meters_scatter_array(
+            [(task_area.bottom_latitude, task_area.top_longitude)])[0]
+        nx = int(np.ceil(width / cell_size - 1e-9)) + 1
+        ny = int(np.ceil(height / cell_size - 1e-9)) + 1
+        ix, iy = np.meshgrid(np.arange(nx), np.arange(ny), indexing='ij')
+        nodes = np.column_stack((ix.ravel(), iy.ravel())) * float(cell_size)
+        latlon = converter.meters_to_latlon_scatter_array(nodes)
+        continuous = converter.latlon_to_meters_continuous_array(latlon)
+        return cls(task_area, cell_size, latlon.reshape(nx, ny, 2), continuous.reshape(nx, ny, 2))
+
+    @classmethod
+    def open(cls, task_area, cell_size: float, cache_dir: str = DEFAULT_CACHE_DIR):
+        """
+        获取查找表：依次使用进程内已加载的表、磁盘缓存，都没有时计算并写入缓存。
+
+        :param task_area: 矩形任务区域对象
+        :param cell_size: 网格边长，单位: m
+        :param cache_dir: 缓存目录，None 为不使用磁盘缓存
+        """
+        key = cls.cache_key(task_area, cell_size)
+        lut = cls._loaded.get(key)
+        if lut is not None:
+            return lut
+
+        file_path = os.path.join(cache_dir, key) if cache_dir is not None else None
+        if file_path is not None and os.path.exists(file_path):
+            try:
+                with np.load(file_path) as data:
+                    lut = cls(task_area, cell_size, data['latlon'], data['continuous'])
+            except (OSError, KeyError, ValueError, AssertionError) as e:
+                logger.warning("查找表缓存 %s 无法读取，将重新计算: %s", file_path, e)
+        if lut is None:
+            lut = cls.build(task_area, cell_size)
+            if file_path is not None:
+                os.makedirs(cache_dir, exist_ok=True)
+                # 先写临时文件再替换，避免并发读取到不完整的缓存
+                temp_path = f"{file_path}.{os.getpid()}.tmp.npz"
+                np.savez(temp_path, latlon=lut.latlon, continuous=lut.continuous)
+                os.replace(temp_path, file_path)
+        lut.latlon.setflags(write=False)
+        lut.continuous.setflags(write=False)
+        cls._loaded[key] = lut
+        return lut
+
+    @property
+    def shape(self):
+        return self.latlon.shape[:2]
+
+    def _interpolate(self, table: np.ndarray, coordinates) -> np.ndarray:
+        # 对 scatter 坐标 (N, 2) [x_m, y_m] 做双线性插值
+        coordinates = np.asarray(coordinates, dtype=np.float64).reshape(-1, 2)
+        nx, ny = self.shape
+        fx = coordinates[:, 0] / self.cell_size
+        fy = coordinates[:, 1] / self.cell_size
+        i0 = np.clip(np.floor(fx).astype(np.int64), 0, nx - 2)
+        j0 = np.clip(np.floor(fy).astype(np.int64), 0, ny - 2)
+        tx = (fx - i0)[:, None]
+        ty = (fy - j0)[:, None]
+        return ((table[i0, j0] * (1 - tx) + table[i0 + 1, j0] * tx) * (1 - ty)
+                + (table[i0, j0 + 1] * (1 - tx) + table[i0 + 1, j0 + 1] * tx) * ty)
+
+    def scatter_to_latlon(self, coordinates) -> np.ndarray:
+        """
+        与 GeoConverter.meters_to_latlon_scatter_array() 相同的换算。
+
+        :param coordinates: (N, 2) 的 scatter 坐标 [x_m, y_m]（东向正为东，南向正为南）
+        :return: (N, 2) 的 [纬度, 经度] 数组
+        """
+        return self._interpolate(self.latlon, coordinates)
+
+    def scatter_to_continuous(self, coordinates) -> np.ndarray:
+        """
+        scatter 坐标转左下角原点坐标，与先 meters_to_latlon_scatter 再 latlon_to_meters_continuous 相同。
+
+        :param coordinates: (N, 2) 的 scatter 坐标 [x_m, y_m]
+        :return: (N, 2) 的 [x_m, y_m] 数组（东向正为东，北向正为北）
+        """
+        return self._interpolate(self.continuous, coordinates)
+
+    def validate(self, samples: int = 10000, seed: int = 0):
+        """
+        在任务区域内随机取点，以测地线换算为基准统计插值误差。
+
+        :return: (经纬度结果的最大误差 m, 左下角原点坐标的最大误差 m)
+        """
+        converter = GeoConverter(self.task_area)
+        nx, ny = self.shape
+        rng = np.random.default_rng(seed)
+        coordinates = np.column_stack((rng.uniform(0, (nx - 1) * self.cell_size, samples),
+                                       rng.uniform(0, (ny - 1) * self.cell_size, samples)))
+        expected = converter.meters_to_latlon_scatter_array(coordinates)
+        latlon = self.scatter_to_latlon(coordinates)
+        _, _, distances = converter.ge_od.inv(expected[:, 1], expected[:, 0], latlon[:, 1], latlon[:, 0])
+        continuous_error = np.abs(self.scatter_to_continuous(coordinates)
+                                  - converter.latlon_to_meters_continuous_array(expected)).max()
+        return float(np.max(distances)), float(continuous_error)
+
+
+def benchmark_grid_lut(cell_size: float = 20.0, points: int = 1000):
+    """
+    比较查找表与测地线换算在任务开始时的耗时，并校验插值误差。
+
+    :param cell_size: 网格边长，单位: m
+    :param points: 每次换算的点数
+    """
+    import time
+    import tempfile
+
+    task_area = RectangularTaskArea()
+    converter = GeoConverter(task_area)
+    with tempfile.TemporaryDirectory() as cache_dir:
+        start = time.perf_counter()
+        lut = GridLUT.open(task_area, cell_size, cache_dir)
+        build_time = time.perf_counter() - start
+        GridLUT._loaded.clear()
+        start = time.perf_counter()
+        lut = GridLUT.open(task_area, cell_size, cache_dir)
+        load_time = time.perf_counter() - start
+    print(f"grid {lut.shape[0]}x{lut.shape[1]}  build {build_time * 1000:.1f} ms  "
+          f"load from cache {load_time * 1000:.1f} ms")
+
+    rng = np.random.default_rng(0)
+    # 任务中的 scatter 航点落在网格节点上
+    nx, ny = lut.shape
+    nodes = np.column_stack((rng.integers(0, nx, points), rng.integers(0, ny, points))) * cell_size
+    for name, run in (("geodesic list", lambda: converter.latlon_to_meters_continuous_list(
+                           converter.meters_to_latlon_scatter_list(nodes.tolist()))),
+                      ("geodesic array", lambda: converter.latlon_to_meters_continuous_array(
+                           converter.meters_to_latlon_scatter_array(nodes))),
+                      ("lookup table", lambda: (lut.scatter_to_latlon(nodes), lut.scatter_to_continuous(nodes)))):
+        start = time.perf_counter()
+        run()
+        print(f"{points} nodes  {name:<15} {(time.perf_counter() - start) * 1000:>9.2f} ms")
+    exact = np.array_equal(lut.scatter_to_latlon(nodes), converter.meters_to_latlon_scatter_array(nodes))
+    latlon_error, continuous_error = lut.validate()
+    print(f"nodes exact {exact}  interpolation max error: latlon {latlon_error:.2e} m  "
+          f"continuous {continuous_error:.2e} m")
+
+
+if __name__ == "__main__":
+    benchmark_grid_lut()
@@ -41,20 +41,21 @@ class Logger:
         # 添加控制台处理器
         self.logger.addHandler(console_handler)
 
-    def debug(self, msg):
-        self.logger.debug(msg)
+    # msg 可带 % 占位符，args 在日志级别生效时才格式化
+    def debug(self, msg, *args):
+        self.logger.debug(msg, *args)
 
-    def info(self, msg):
-        self.logger.info(msg)
+    def info(self, msg, *args):
+        self.logger.info(msg, *args)
 
-    def warning(self, msg):
-        self.logger.warning(msg)
+    def warning(self, msg, *args):
+        self.logger.warning(msg, *args)
 
-    def error(self, msg):
-        self.logger.error(msg)
+    def error(self, msg, *args):
+        self.logger.error(msg, *args)
 
-    def critical(self, msg):
-        self.logger.critical(msg)
+    def critical(self, msg, *args):
+        self.logger.critical(msg, *args)
 
 
 # 创建日志
@@ -0,0 +1,358 @@
+import numpy as np
+from dataclasses import dataclass
+from pyproj import Geod
+from los.geometry import ecef_array
+from los.los_controller import LOSController
+from los.tool import to_kn, to_mps
+
+
+def _angle_error_180(angle1, angle2):
+    # calculate_angle_error_180() 的数组版本，同样只做一次 ±360 调整
+    error = np.subtract(angle1, angle2, dtype=np.float64)
+    error[error > 180.0] -= 360.0
+    error[error < -180.0] += 360.0
+    return error
+
+
+@dataclass
+class BatchLOSResult:
+    flag: np.ndarray = None           # NavigationControl.flag
+    turn_angle: np.ndarray = None     # NavigationControl.fTurnAngle，0 - 360
+    forward_vel: np.ndarray = None    # NavigationControl.fForwardVel，单位: kn
+    updated: np.ndarray = None        # 本次 tick 是否计算了控制量（切换航段或航线结束的 tick 为 False）
+    switched: np.ndarray = None       # 本次 tick 是否切换到下一航段
+    lat_dist: np.ndarray = None       # 侧偏距，左正右负，单位: m
+    to_dest_angle: np.ndarray = None  # 到目标航点的角度，-180 - 180
+    to_dest_dist: np.ndarray = None   # 到目标航点的距离，单位: m
+    look_ahead: np.ndarray = None     # LOS 前视距离，单位: m（未计算控制量时为 nan）
+    yaw_err: np.ndarray = None        # 艏向角偏差，-150 - 150
+    task_num: np.ndarray = None       # 当前任务序号 usCurTaskNum
+
+
+class BatchLOSEngine:
+    def __init__(self, fast_geometry: bool = False):
+        """
+        多艇 LOS 的向量化实现：所有艇的状态保存在数组中，一次 tick() 用 NumPy 完成全部艇的计算，
+        结果与逐艇调用 LOSController.tick() 在浮点误差范围内一致。
+
+        参数与各算法分支取自 LOSController 的默认配置；不支持 auto_rejoin，
+        LOS 角的 atanh 超出定义域时 LOSController 抛出 ValueError，此处结果为 nan。
+
+        :param fast_geometry: 与 LOSController 的同名参数相同，True 时在航段起点的切平面中计算
+        """
+        template = LOSController()
+        assert (template.kind_of_predict, template.kind_of_switch, template.kind_of_los_pre, template.kind_of_delta,
+                template.kind_of_approach, template.advance_control, template.iUseAccLatMethod) == \
+            (3, 1, 2, 0, 1, 0, 1), "BatchLOSEngine 只支持 LOSController 的默认算法分支"
+        self.time_delay = template.timeDelay
+        self.rate_delay = template.rateDelay
+        self.factor_k = template.factor_k
+        self.length = template.iLength
+        self.fast_geometry = fast_geometry
+        self.ge_od = Geod(ellps='WGS84')
+        self.size = 0
+
+    def load_paths(self, paths: list, latitudes, longitudes):
+        """
+        为每艘艇加载航线，等价于对每艘艇调用 LOSController.get_path_info()。
+
+        :param paths: 每艘艇的航线（geopy Point 列表），至少 2 个航点
+        :param latitudes: 各艇当前纬度，作为航线起点
+        :param longitudes: 各艇当前经度
+        """
+        size = len(paths)
+        latitudes = np.asarray(latitudes, dtype=np.float64).reshape(size)
+        longitudes = np.asarray(longitudes, dtype=np.float64).reshape(size)
+        assert all(len(path) >= 2 for path in paths), "每条航线至少需要 2 个航点"
+
+        # 所有航线首尾相接存放在同一数组中，每条航线前插入该艇位置
+        point_lat = []
+        point_lon = []
+        first = np.empty(size, dtype=np.int64)
+        for boat, path in enumerate(paths):
+            first[boat] = len(point_lat)
+            point_lat.append(latitudes[boat])
+            point_lon.append(longitudes[boat])
+            point_lat.extend(point.latitude for point in path)
+            point_lon.extend(point.longitude for point in path)
+        self._lat = np.array(point_lat, dtype=np.float64)
+        self._lon = np.array(point_lon, dtype=np.float64)
+        self._last = first + np.array([len(path) for path in paths], dtype=np.int64)  # 每条航线最后一个航点的下标
+        self._point_num = np.array([len(path) for path in paths], dtype=np.int64)     # PathPointNum
+
+        # 航段 k 为 (点 k, 点 k + 1)，跨航线的航段不会被使用
+        start_lat, start_lon = self._lat[:-1], self._lon[:-1]
+        end_lat, end_lon = self._lat[1:], self._lon[1:]
+        azimuth, _, length = self.ge_od.inv(start_lon, start_lat, end_lon, end_lat)
+        self._seg_bearing = (np.asarray(azimuth) + 360) % 360
+        self._seg_length = np.asarray(length)
+        if self.fast_geometry:
+            phi = np.radians(start_lat)
+            lam = np.radians(start_lon)
+            self._sin_phi, self._cos_phi = np.sin(phi), np.cos(phi)
+            self._sin_lam, self._cos_lam = np.sin(lam), np.cos(lam)
+            self._x0, self._y0, self._z0 = ecef_array(start_lat, start_lon)
+            segments = np.arange(len(start_lat))
+            self._dest_east, self._dest_north = self._to_enu(segments, end_lat, end_lon)
+            self._plane_length = np.hypot(self._dest_east, self._dest_north)
+            with np.errstate(invalid='ignore', divide='ignore'):
+                self._unit_east = np.nan_to_num(self._dest_east / self._plane_length)
+                self._unit_north = np.nan_to_num(self._dest_north / self._plane_length)
+
+        # 各艇状态，对应 LOSController 的同名属性
+        self.size = size
+        self._segment = first + 1                                  # 当前航段起点下标
+        self._current = {}                                         # 当前航段的几何量，只在切换航段时更新
+        self._load_segments(np.arange(size))
+        self.task_num = np.ones(size, dtype=np.int64)              # usCurTaskNum
+        self._pre_lat_dist = np.zeros(size)                        # fPreLatDist
+        self._lat_dist_i = np.zeros(size)                          # fLatDist_I
+        self._cnt_pi = np.zeros(size, dtype=np.int64)              # iCntPi
+        self._window = np.zeros((size, self.length))               # fLengthOfLatDist（环形）
+        self._window_head = np.zeros(size, dtype=np.int64)
+        self.flag = np.zeros(size, dtype=np.int64)                 # navigation_control，未计算时保持上一次的值
+        self.turn_angle = np.zeros(size)
+        self.forward_vel = np.zeros(size)
+
+    def _load_segments(self, rows):
+        # 将 rows 中各艇当前航段的几何量从航段数组取到按艇排列的数组中
+        segment = self._segment[rows]
+        columns = {
+            'bearing': self._seg_bearing,
+            'length': self._seg_length,
+            'from_lat': self._lat[:-1],
+            'from_lon': self._lon[:-1],
+            'dest_lat': self._lat[1:],
+            'dest_lon': self._lon[1:],
+        }
+        if self.fast_geometry:
+            columns.update(x0=self._x0, y0=self._y0, z0=self._z0, sin_phi=self._sin_phi, cos_phi=self._cos_phi,
+                           sin_lam=self._sin_lam, cos_lam=self._cos_lam, dest_east=self._dest_east,
+                           dest_north=self._dest_north, unit_east=self._unit_east, unit_north=self._unit_north,
+                           plane_length=self._plane_length)
+        current = self._current
+        for name, column in columns.items():
+            if name not in current:
+                current[name] = np.empty(self.size)
+            current[name][rows] = column[segment]
+        if 'track_angle' not in current:
+            current['track_angle'] = np.empty(self.size)
+        current['track_angle'][rows] = _angle_error_180(current['bearing'][rows], 0.0)
+
+    def _to_enu(self, segments, latitudes, longitudes):
+        # 各点在各自航段起点切平面中的坐标
+        x, y, z = ecef_array(latitudes, longitudes)
+        dx = x - self._x0[segments]
+        dy = y - self._y0[segments]
+        dz = z - self._z0[segments]
+        sin_phi, cos_phi = self._sin_phi[segments], self._cos_phi[segments]
+        sin_lam, cos_lam = self._sin_lam[segments], self._cos_lam[segments]
+        east = -sin_lam * dx + cos_lam * dy
+        north = -sin_phi * cos_lam * dx - sin_phi * sin_lam * dy + cos_phi * dz
+        return east, north
+
+    def _current_enu(self, latitudes, longitudes):
+        # 各艇位置在其当前航段起点切平面中的坐标
+        current = self._current
+        x, y, z = ecef_array(latitudes, longitudes)
+        x -= current['x0']
+        y -= current['y0']
+        z -= current['z0']
+        sin_phi, cos_phi = current['sin_phi'], current['cos_phi']
+        sin_lam, cos_lam = current['sin_lam'], current['cos_lam']
+        east = cos_lam * y - sin_lam * x
+        north = cos_phi * z - sin_phi * (cos_lam * x + sin_lam * y)
+        return east, north
+
+    def tick(self, latitudes, longitudes, headings, speeds, heading_rates=None) -> BatchLOSResult:
+        """
+        所有艇执行一次 LOS 计算，等价于对每艘艇依次调用 get_usv_info() 与 tick()。
+
+        :param latitudes: 各艇纬度
+        :param longitudes: 各艇经度
+        :param headings: 各艇艏向角，单位: °
+        :param speeds: 各艇航速，单位: m/s
+        :param heading_rates: 各艇艏向角速度，单位: °/s，None 为 0（与 get_usv_info() 一致）
+        """
+        assert self.size, "未加载航线，请先调用 load_paths()"
+        size = self.size
+        latitudes = np.asarray(latitudes, dtype=np.float64).reshape(size)
+        longitudes = np.asarray(longitudes, dtype=np.float64).reshape(size)
+        headings = np.asarray(headings, dtype=np.float64).reshape(size)
+        speeds = np.asarray(speeds, dtype=np.float64).reshape(size)
+        heading_rates = np.zeros(size) if heading_rates is None else \
+            np.asarray(heading_rates, dtype=np.float64).reshape(size)
+        rows = np.arange(size)
+        current = self._current
+
+        # _get_info_straight()
+        track_angle = current['track_angle']
+        if self.fast_geometry:
+            east, north = self._current_enu(latitudes, longitudes)
+            d_east = current['dest_east'] - east
+            d_north = current['dest_north'] - north
+            to_dest_angle = np.degrees(np.arctan2(d_east, d_north))
+            to_dest_dist = np.hypot(d_east, d_north)
+        else:
+            azimuth, _, to_dest_dist = self.ge_od.inv(longitudes, latitudes, current['dest_lon'], current['dest_lat'])
+            to_dest_angle = (np.asarray(azimuth) + 360) % 360
+            to_dest_dist = np.asarray(to_dest_dist)
+        to_dest_angle = _angle_error_180(to_dest_angle, 0.0)
+        ang_err = _angle_error_180(track_angle, to_dest_angle)
+        lat_dist = -(to_dest_dist * np.sin(np.radians(ang_err)))
+
+        pre = self._pre_lat_dist
+        clear = ((pre <= 0) & (0 <= lat_dist)) | ((pre >= 0) & (0 >= lat_dist))
+        if clear.any():
+            self._window[clear] = 0.0
+            self._window_head[clear] = 0
+        head = self._window_head - 1
+        head[head < 0] = self.length - 1
+        self._window_head = head
+        self._window[rows, head] = lat_dist
+
+        # if_switch_line()
+        if self.fast_geometry:
+            passed = east * current['unit_east'] + north * current['unit_north'] >= current['plane_length']
+        else:
+            azimuth, _, from_dist = self.ge_od.inv(current['from_lon'], current['from_lat'], longitudes, latitudes)
+            from_angle = (np.asarray(azimuth) + 360) % 360
+            angle_error = np.abs(_angle_error_180(current['bearing'] - from_angle, 0.0))
+            passed = np.asarray(from_dist) * np.cos(np.radians(angle_error)) >= current['length']
+        change_length = np.where(self.task_num == self._point_num, 20.0, 4 * 10.0)
+        switch = (to_dest_dist < change_length) | passed
+        tracking = ~switch
+        switched = switch & (self._segment + 1 < self._last)
+        if switched.any():
+            self._segment = self._segment + switched
+            self.task_num = self.task_num + switched
+            self._load_segments(np.flatnonzero(switched))
+
+        # _calculate_yaw_error()：kind_of_approach = 1 时艏向偏差由 LOS 重新计算，
+        # 这里只保留对后续 tick 有影响的预测侧偏距与侧偏距积分
+        yaw_angle = _angle_error_180(track_angle, headings)
+        predict = lat_dist + speeds * self.time_delay * np.sin(np.radians(yaw_angle - heading_rates * self.rate_delay))
+        self._pre_lat_dist = np.where(tracking, predict, lat_dist)
+        lat_dist_i = self._lat_dist_i + lat_dist / 10.0
+        cnt_pi = self._cnt_pi + 1
+        reset = cnt_pi >= 50
+        self._lat_dist_i = np.where(tracking, np.where(reset, 0.0, lat_dist_i), self._lat_dist_i)
+        self._cnt_pi = np.where(tracking, np.where(reset, 0, cnt_pi), self._cnt_pi)
+
+        # _calculate_optimal_yaw_error_by_los()
+        fast = speeds > 9
+        min_ahead = np.where(fast, 100.0, 30.0)
+        max_ahead = np.where(fast, 200.0, 60.0)
+        look_ahead = min_ahead + (max_ahead - min_ahead) * np.exp(self.factor_k * np.abs(lat_dist) ** 3)
+        ang_err = _angle_error_180(ang_err, 0.0)
+        direct = ((-90.0 <= ang_err) & (ang_err <= 90.0)) | (to_dest_dist < 30.0)
+        f_tmp = lat_dist + 3.5 * self._window.sum(axis=1) / self.length
+        with np.errstate(invalid='ignore', divide='ignore'):
+            los_angle = np.radians(np.arctanh(f_tmp / look_ahead))
+        los_angle = np.clip(los_angle, -60.0, 60.0)
+        track_los_angle = np.where(direct, _angle_error_180(to_dest_angle, track_angle), los_angle)
+        los_line_angle = _angle_error_180(track_angle + track_los_angle, 0.0)
+        yaw_err = _angle_error_180(los_line_angle, headings)
+
+        # _straight_line_tracking()
+        yaw_err = np.clip(_angle_error_180(yaw_err, 0.0), -150.0, 150.0)
+        turn_angle = headings + yaw_err
+        turn_angle = np.where(turn_angle > 360.0, turn_angle - 360.0,
+                              np.where(turn_angle < 0.0, turn_angle + 360.0, turn_angle))
+        self.flag = np.where(tracking, 1, self.flag)
+        self.turn_angle = np.where(tracking, turn_angle, self.turn_angle)
+        self.forward_vel = np.where(tracking, to_kn(to_mps(10)), self.forward_vel)
+
+        return BatchLOSResult(flag=self.flag, turn_angle=self.turn_angle, forward_vel=self.forward_vel,
+                              updated=tracking, switched=switched, lat_dist=lat_dist, to_dest_angle=to_dest_angle,
+                              to_dest_dist=to_dest_dist, look_ahead=np.where(tracking, look_ahead, np.nan),
+                              yaw_err=yaw_err, task_num=self.task_num)
+
+
+def compare_with_scalar(num_boats: int = 20, ticks: int = 300, fast_geometry: bool = False, seed: int = 0):
+    """
+    随机航线与随机轨迹下，比较 BatchLOSEngine 与逐艇 LOSController 的输出。
+
+    :return: (最大航向差 °, 最大侧偏距差 m, 航段序号不一致的次数)
+    """
+    import logging
+    from geopy import Point
+    from log.log import logger
+    from message.boat_struct import BoatMessage
+
+    level = logger.logger.level
+    logger.logger.setLevel(logging.INFO)
+    rng = np.random.default_rng(seed)
+    paths = [[Point(latitude=30.80 + rng.uniform(-0.01, 0.01), longitude=122.75 + rng.uniform(-0.01, 0.01))
+              for _ in range(8)] for _ in range(num_boats)]
+    # 各艇沿自己的航线前进并叠加随机偏移，覆盖航段切换、LOS 前视与直接指向目标等分支
+    route = np.array([[(point.latitude, point.longitude) for point in path] for path in paths])
+    progress = np.linspace(0.0, len(route[0]) - 1, ticks)
+    track = np.stack([np.stack([np.interp(progress, np.arange(len(path)), path[:, axis]) for axis in range(2)],
+                               axis=-1) for path in route], axis=1)  # (ticks, num_boats, 2)
+    track = track + rng.normal(0.0, 0.0004, track.shape)
+    latitudes = np.full(num_boats, 30.80)
+    longitudes = np.full(num_boats, 122.75)
+    controllers = []
+    for boat in range(num_boats):
+        controller = LOSController(fast_geometry)
+        controller.get_path_info(paths[boat], BoatMessage(latitude=latitudes[boat], longitude=longitudes[boat]))
+        controllers.append(controller)
+    engine = BatchLOSEngine(fast_geometry)
+    engine.load_paths(paths, latitudes, longitudes)
+
+    max_angle_error = 0.0
+    max_lat_error = 0.0
+    task_mismatch = 0
+    for step in range(ticks):
+        latitudes, longitudes = track[step, :, 0], track[step, :, 1]
+        headings = rng.uniform(0, 360, num_boats)
+        speeds = rng.uniform(0, 12, num_boats)
+        result = engine.tick(latitudes, longitudes, headings, speeds)
+        for boat, controller in enumerate(controllers):
+            controller.get_usv_info(BoatMessage(usv_id=boat, latitude=latitudes[boat], longitude=longitudes[boat],
+                                                heading_angle=headings[boat], forward_speed=speeds[boat]))
+            try:
+                controller.tick()
+            except ValueError:  # atanh 超出定义域
+                continue
+            angle_error = abs((controller.navigation_control.fTurnAngle - result.turn_angle[boat] + 180) % 360 - 180)
+            max_angle_error = max(max_angle_error, angle_error)
+            max_lat_error = max(max_lat_error, abs(controller.boat_data.fLatDist - result.lat_dist[boat]))
+            task_mismatch += controller.single_path_info.usCurTaskNum != result.task_num[boat]
+    logger.logger.setLevel(level)
+    return max_angle_error, max_lat_error, task_mismatch
+
+
+def benchmark_batch_los(sizes=(100, 1000, 10000), ticks: int = 20):
+    """
+    BatchLOSEngine 的吞吐量（艇次/毫秒），并与逐艇 LOSController 比较。
+
+    :param sizes: 艇数
+    :param ticks: 每项测试的 tick 数
+    """
+    import time
+    from geopy import Point
+
+    for fast_geometry in (False, True):
+        angle_error, lat_error, mismatch = compare_with_scalar(fast_geometry=fast_geometry)
+        print(f"fast_geometry={fast_geometry!s:<5}  vs LOSController: max turn angle error {angle_error:.2e} deg  "
+              f"max lat dist error {lat_error:.2e} m  segment mismatches {mismatch}")
+        for size in sizes:
+            rng = np.random.default_rng(size)
+            path = [Point(latitude=30.800 + 0.002 * i, longitude=122.750 + 0.002 * i) for i in range(20)]
+            engine = BatchLOSEngine(fast_geometry)
+            latitudes = 30.7995 + rng.uniform(-0.001, 0.001, size)
+            longitudes = 122.7500 + rng.uniform(-0.001, 0.001, size)
+            engine.load_paths([path] * size, latitudes, longitudes)
+            headings = np.full(size, 45.0)
+            speeds = np.full(size, 5.0)
+            start = time.perf_counter()
+            for step in range(ticks):
+                engine.tick(latitudes + 0.00002 * step, longitudes + 0.00002 * step, headings, speeds)
+            elapsed = (time.perf_counter() - start) / ticks
+            print(f"    {size:>6} boats  {elapsed * 1000:>8.2f} ms/tick  {size / elapsed / 1000:>8.1f} boat-ticks/ms")
+
+
+if __name__ == "__main__":
+    benchmark_batch_los()
@@ -0,0 +1,108 @@
+from dataclasses import dataclass
+from log.log import logger
+from los.los_controller import LOSController
+from message.boat_struct import BoatMessage, MotionControl
+
+
+@dataclass
+class BoatControl:
+    usv_id: int                                   # 艇全局编号
+    controller: LOSController                     # 该艇独立的 LOS 控制器（含航线与积分状态）
+    motion_control: MotionControl = None          # 该艇最近一次的控制输出
+    last_message: BoatMessage = None              # 最近一次 tick 使用的惯导数据
+    ticks: int = 0                                # 已执行的 tick 数
+
+
+@dataclass
+class FleetTickStats:
+    passes: int = 0      # 调度轮数
+    ticked: int = 0      # 累计 tick 的艇次
+    no_data: int = 0     # 已分配航线但尚未收到惯导数据的艇次
+    unchanged: int = 0   # only_updated 模式下因惯导未更新而跳过的艇次
+
+
+class FleetController:
+    def __init__(self, default_path: list = None, motion_control_mode: int = 3, controller_factory=LOSController):
+        """
+        多艇 LOS 控制：按 usv_id 为每艘艇维护独立的 LOSController、航线与 MotionControl，
+        每个调度周期调用一次 tick() 完成所有艇的控制计算。
+
+        :param default_path: 默认航线（geopy Point 列表），首次出现且未单独分配航线的艇使用该航线；None 时不自动加入
+        :param motion_control_mode: 输出 MotionControl 的运动控制模式
+        :param controller_factory: 创建 LOSController 的函数，无参数
+        """
+        self.default_path = default_path
+        self.motion_control_mode = motion_control_mode
+        self.controller_factory = controller_factory
+        self.stats = FleetTickStats()
+        self._boats = {}  # usv_id -> BoatControl
+
+    def __len__(self):
+        return len(self._boats)
+
+    def __contains__(self, usv_id):
+        return usv_id in self._boats
+
+    def ids(self) -> list:
+        return list(self._boats)
+
+    def get(self, usv_id) -> BoatControl:
+        return self._boats.get(usv_id)
+
+    def assign_path(self, usv_id: int, path_pts: list, usv_ins: BoatMessage) -> BoatControl:
+        """
+        为指定艇分配航线，已存在时重置其控制器。
+
+        :param usv_id: 艇全局编号
+        :param path_pts: 航线（geopy Point 列表）
+        :param usv_ins: 该艇当前惯导数据，其位置作为航线起点
+        """
+        assert usv_ins.usv_id == usv_id, f"惯导数据 usv_id {usv_ins.usv_id} 与 {usv_id} 不一致"
+        controller = self.controller_factory()
+        controller.get_path_info(path_pts, usv_ins)
+        motion_control = MotionControl(usv_id=usv_id, motion_control_mode=self.motion_control_mode)
+        boat = BoatControl(usv_id=usv_id, controller=controller, motion_control=motion_control)
+        self._boats[usv_id] = boat
+        logger.info(f"usv {usv_id} 已分配航线，航点数 {len(path_pts)}")
+        return boat
+
+    def remove(self, usv_id: int):
+        self._boats.pop(usv_id, None)
+
+    def tick(self, boats: dict, only_updated: bool = False) -> list:
+        """
+        对所有已分配航线的艇执行一次 LOS 计算。
+
+        :param boats: {usv_id: BoatMessage}，如 MissionSnapshot.boats
+        :param only_updated: True 时只计算惯导数据相比上一次 tick 已更新的艇
+        :return: 本轮更新的 MotionControl 列表
+        """
+        self.stats.passes += 1
+        if self.default_path is not None:
+            for usv_id, usv_ins in boats.items():
+                if usv_id not in self._boats:
+                    self.assign_path(usv_id, self.default_path, usv_ins)
+
+        controls = []
+        for usv_id, boat in self._boats.items():
+            usv_ins = boats.get(usv_id)
+            if usv_ins is None:
+                self.stats.no_data += 1
+                continue
+            if only_updated and usv_ins is boat.last_message:
+                self.stats.unchanged += 1
+                continue
+
+            controller = boat.controller
+            controller.get_usv_info(usv_ins)
+            controller.tick()
+            navigation_control = controller.navigation_control
+
+            motion_control = boat.motion_control
+            motion_control.throttle_or_speed = navigation_control.fForwardVel
+            motion_control.rudder_angle_or_heading = navigation_control.fTurnAngle
+            boat.last_message = usv_ins
+            boat.ticks += 1
+            controls.append(motion_control)
+        self.stats.ticked += len(controls)
+        return controls
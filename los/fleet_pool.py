@@ -0,0 +1,257 @@
+import os
+import time
+import multiprocessing
+from dataclasses import dataclass
+from geopy import Point
+from log.log import logger
+from los.fleet import FleetController
+from message.boat_struct import BoatMessage, MotionControl
+
+# 主进程 -> 工作进程的命令
+_CMD_TICK = 0    # (更新列表, only_updated)
+_CMD_ASSIGN = 1  # (usv_id, 航线, 惯导更新)
+_CMD_STOP = 2
+
+
+@dataclass
+class ShardStats:
+    ticks: int = 0                 # 调度轮数
+    boats: int = 0                 # 累计计算的艇次
+    updates: int = 0               # 累计下发的惯导更新数
+    compute_time: float = 0.0      # 工作进程内 LOS 计算累计耗时，单位: s
+    max_compute_time: float = 0.0  # 单轮最大计算耗时，单位: s
+    round_trip: float = 0.0        # 主进程下发到收回结果的累计耗时，单位: s
+    max_round_trip: float = 0.0    # 单轮最大往返耗时，单位: s
+    restarts: int = 0              # 工作进程异常退出后重启的次数
+
+    @property
+    def mean_compute_time(self) -> float:
+        return self.compute_time / self.ticks if self.ticks else 0.0
+
+
+def _compact_update(usv_ins: BoatMessage) -> tuple:
+    # LOS 只用到位置、艏向与航速，下发时只传这几个字段
+    return usv_ins.usv_id, usv_ins.latitude, usv_ins.longitude, usv_ins.heading_angle, usv_ins.forward_speed
+
+
+def _apply_update(boats: dict, update: tuple):
+    usv_id, latitude, longitude, heading_angle, forward_speed = update
+    boats[usv_id] = BoatMessage(usv_id=usv_id, latitude=latitude, longitude=longitude,
+                                heading_angle=heading_angle, forward_speed=forward_speed)
+
+
+def _to_points(path: list) -> list:
+    return [Point(latitude=latitude, longitude=longitude) for latitude, longitude in path]
+
+
+def _shard_worker(conn, default_path, motion_control_mode):
+    # 工作进程：持有本分片各艇的 LOSController，按命令计算并成批返回结果
+    fleet = FleetController(default_path=_to_points(default_path) if default_path is not None else None,
+                            motion_control_mode=motion_control_mode)
+    boats = {}
+    while True:
+        command, payload = conn.recv()
+        if command == _CMD_STOP:
+            break
+        if command == _CMD_ASSIGN:
+            usv_id, path, update = payload
+            _apply_update(boats, update)
+            fleet.assign_path(usv_id, _to_points(path), boats[usv_id])
+            continue
+        updates, only_updated = payload
+        for update in updates:
+            _apply_update(boats, update)
+        start = time.perf_counter()
+        controls = fleet.tick(boats, only_updated)
+        elapsed = time.perf_counter() - start
+        conn.send(([(c.usv_id, c.throttle_or_speed, c.rudder_angle_or_heading) for c in controls], elapsed))
+    conn.close()
+
+
+class ShardedFleetController:
+    def __init__(self, num_shards: int = None, default_path: list = None, motion_control_mode: int = 3,
+                 mp_context=None):
+        """
+        多进程多艇 LOS 控制：按 usv_id % num_shards 将艇分配到常驻工作进程，
+        每个工作进程持有本分片的 FleetController，与 FleetController 接口一致。
+
+        每轮只向工作进程下发惯导已变化艇的精简状态，工作进程成批返回 (usv_id, 航速, 航向)，
+        各分片并行计算，主进程汇总为 MotionControl。工作进程异常退出时记录日志并重启该分片，
+        重新下发该分片各艇的航线，本轮缺少该分片的结果。
+
+        :param num_shards: 工作进程数，None 为 CPU 核数
+        :param default_path: 默认航线（geopy Point 列表），新出现的艇自动使用该航线
+        :param motion_control_mode: 输出 MotionControl 的运动控制模式
+        :param mp_context: multiprocessing 上下文，None 为 spawn（调用方通常已有接收、转发等线程在运行，
+                           fork 出的子进程可能继承被其他线程持有的锁，如日志 handler 的锁，导致死锁）
+        """
+        self.num_shards = num_shards or os.cpu_count() or 1
+        assert self.num_shards > 0, "工作进程数必须大于 0"
+        self.motion_control_mode = motion_control_mode
+        self.stats = [ShardStats() for _ in range(self.num_shards)]
+        self._default_path = None
+        if default_path is not None:
+            self._default_path = [(point.latitude, point.longitude) for point in default_path]
+        self._context = mp_context or multiprocessing.get_context('spawn')
+        self._connections = []
+        self._processes = []
+        self._sent = {}             # usv_id -> 最近一次下发的 BoatMessage
+        self._assigned = {}         # usv_id -> 通过 assign_path() 分配的航线，分片重启时重新下发
+        self._motion_controls = {}  # usv_id -> MotionControl
+
+    def _start_shard(self, index):
+        parent_conn, child_conn = self._context.Pipe()
+        process = self._context.Process(target=_shard_worker, name=f"los-shard-{index}", daemon=True,
+                                        args=(child_conn, self._default_path, self.motion_control_mode))
+        process.start()
+        child_conn.close()
+        return parent_conn, process
+
+    def start(self):
+        for index in range(self.num_shards):
+            conn, process = self._start_shard(index)
+            self._connections.append(conn)
+            self._processes.append(process)
+        logger.info(f"LOS 分片工作进程已启动，共 {self.num_shards} 个")
+        return self
+
+    def _restart_shard(self, index, error):
+        # 工作进程异常退出：重启并重新下发该分片各艇的航线，惯导在下一轮 tick 时重新下发
+        process = self._processes[index]
+        process.join(1.0)
+        logger.error("LOS 分片 %d 工作进程异常退出（exitcode %s, %r），正在重启", index, process.exitcode, error)
+        self._connections[index].close()
+        self._connections[index], self._processes[index] = self._start_shard(index)
+        self.stats[index].restarts += 1
+        for usv_id in [usv_id for usv_id in self._sent if self.shard_of(usv_id) == index]:
+            usv_ins = self._sent.pop(usv_id)
+            path = self._assigned.get(usv_id)
+            if path is not None:
+                self._connections[index].send((_CMD_ASSIGN, (usv_id, path, _compact_update(usv_ins))))
+                self._sent[usv_id] = usv_ins
+
+    def stop(self, timeout=None):
+        for conn in self._connections:
+            try:
+                conn.send((_CMD_STOP, None))
+            except OSError:
+                pass
+            conn.close()
+        for process in self._processes:
+            process.join(timeout)
+        self._connections = []
+        self._processes = []
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
+
+    def shard_of(self, usv_id: int) -> int:
+        return usv_id % self.num_shards
+
+    def assign_path(self, usv_id: int, path_pts: list, usv_ins: BoatMessage):
+        """
+        为指定艇分配航线，已存在时重置其控制器。参数同 FleetController.assign_path()。
+        """
+        assert usv_ins.usv_id == usv_id, f"惯导数据 usv_id {usv_ins.usv_id} 与 {usv_id} 不一致"
+        path = [(point.latitude, point.longitude) for point in path_pts]
+        index = self.shard_of(usv_id)
+        self._assigned[usv_id] = path
+        try:
+            self._connections[index].send((_CMD_ASSIGN, (usv_id, path, _compact_update(usv_ins))))
+            self._sent[usv_id] = usv_ins
+        except OSError as e:
+            # 重启时跳过该艇，只由下面一次下发携带新的惯导数据重建其控制器
+            self._sent.pop(usv_id, None)
+            self._restart_shard(index, e)
+            self._connections[index].send((_CMD_ASSIGN, (usv_id, path, _compact_update(usv_ins))))
+            self._sent[usv_id] = usv_ins
+
+    def tick(self, boats: dict, only_updated: bool = False) -> list:
+        """
+        所有分片并行执行一次 LOS 计算。参数与返回值同 FleetController.tick()。
+        """
+        assert self._connections, "工作进程未启动，请先调用 start()"
+        updates = [[] for _ in range(self.num_shards)]
+        for usv_id, usv_ins in boats.items():
+            if self._sent.get(usv_id) is not usv_ins:
+                updates[self.shard_of(usv_id)].append(_compact_update(usv_ins))
+                self._sent[usv_id] = usv_ins
+
+        # 先全部下发再逐个收回，各分片同时计算
+        start = time.perf_counter()
+        failed = {}
+        for index, (conn, shard_updates) in enumerate(zip(self._connections, updates)):
+            try:
+                conn.send((_CMD_TICK, (shard_updates, only_updated)))
+            except OSError as e:
+                failed[index] = e
+
+        controls = []
+        for index, conn in enumerate(self._connections):
+            if index not in failed:
+                try:
+                    results, elapsed = conn.recv()
+                except (EOFError, OSError) as e:
+                    failed[index] = e
+            if index in failed:
+                self._restart_shard(index, failed[index])
+                continue
+            round_trip = time.perf_counter() - start
+            stats = self.stats[index]
+            stats.ticks += 1
+            stats.boats += len(results)
+            stats.updates += len(updates[index])
+            stats.compute_time += elapsed
+            stats.max_compute_time = max(stats.max_compute_time, elapsed)
+            stats.round_trip += round_trip
+            stats.max_round_trip = max(stats.max_round_trip, round_trip)
+            for usv_id, speed, heading in results:
+                motion_control = self._motion_controls.get(usv_id)
+                if motion_control is None:
+                    motion_control = MotionControl(usv_id=usv_id, motion_control_mode=self.motion_control_mode)
+                    self._motion_controls[usv_id] = motion_control
+                motion_control.throttle_or_speed = speed
+                motion_control.rudder_angle_or_heading = heading
+                controls.append(motion_control)
+        return controls
+
+
+def benchmark_fleet(num_boats: int = 100, shards=(0, 1, 2, 4), ticks: int = 20):
+    """
+    比较单进程 FleetController 与多进程 ShardedFleetController 的吞吐量（艇次/秒）。
+
+    :param num_boats: 艇数
+    :param shards: 工作进程数，0 表示在当前进程中计算
+    :param ticks: 每项测试的调度轮数
+    """
+    path = [Point(latitude=30.800 + 0.001 * i, longitude=122.750 + 0.001 * i) for i in range(10)]
+
+    def fleet_state(step):
+        return {usv_id: BoatMessage(usv_id=usv_id, latitude=30.799 - 0.00001 * usv_id + 0.00005 * step,
+                                    longitude=122.750 + 0.00005 * step, heading_angle=45.0, forward_speed=5.0)
+                for usv_id in range(1, num_boats + 1)}
+
+    states = [fleet_state(step) for step in range(ticks)]
+    for num_shards in shards:
+        fleet = FleetController(default_path=path) if num_shards == 0 else \
+            ShardedFleetController(num_shards, default_path=path).start()
+        fleet.tick(states[0])  # 首轮包含航线分配，不计时
+        start = time.perf_counter()
+        for boats in states[1:]:
+            fleet.tick(boats)
+        elapsed = time.perf_counter() - start
+        rate = num_boats * (ticks - 1) / elapsed
+        print(f"{num_boats:>4} boats  shards {num_shards:<3} {rate:>10.0f} boat-ticks/s  "
+              f"{elapsed / (ticks - 1) * 1000:>8.2f} ms/tick")
+        if num_shards:
+            for index, stats in enumerate(fleet.stats):
+                print(f"           shard {index}  compute {stats.mean_compute_time * 1000:>8.2f} ms/tick  "
+                      f"max round trip {stats.max_round_trip * 1000:>8.2f} ms")
+            fleet.stop()
+
+
+if __name__ == "__main__":
+    benchmark_fleet()
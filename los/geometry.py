@@ -0,0 +1,190 @@
+import math
+import numpy as np
+from dataclasses import dataclass, field
+from geopy import Point
+from geopy.distance import distance
+from pyproj import Geod
+
+# WGS84 椭球参数
+WGS84_A = 6378137.0
+WGS84_F = 1 / 298.257223563
+WGS84_E2 = WGS84_F * (2 - WGS84_F)
+
+# 切平面近似的误差（相对 WGS84 测地线，见 validate_enu()）：
+#   以航段起点为原点，设 L 为点到原点的最大距离、R ≈ 6.371e6 m、φ 为纬度，
+#   距离误差为 (L/R)² 量级，实测 L = 5 km 时 0.5 mm、10 km 时 4 mm、20 km 时 3.3 cm；
+#   方位角误差主要来自子午线收敛，约为 L·tanφ/R rad，实测 φ = 30.8° 时 L = 5 km 为 0.027°、10 km 为 0.054°。
+# 航段较长或远离航段时应关闭 fast_geometry 使用测地线计算。
+
+
+def ecef_array(latitudes, longitudes):
+    """
+    经纬度（高度取 0）转地心地固坐标。
+
+    :return: (x, y, z) 三个 ndarray，单位: m
+    """
+    phi = np.radians(np.asarray(latitudes, dtype=np.float64))
+    lam = np.radians(np.asarray(longitudes, dtype=np.float64))
+    sin_phi = np.sin(phi)
+    cos_phi = np.cos(phi)
+    n = WGS84_A / np.sqrt(1 - WGS84_E2 * sin_phi * sin_phi)
+    return n * cos_phi * np.cos(lam), n * cos_phi * np.sin(lam), n * (1 - WGS84_E2) * sin_phi
+
+
+class EnuFrame:
+    def __init__(self, latitude: float, longitude: float):
+        """
+        以 (latitude, longitude) 为原点的局部东-北-天（ENU）切平面，高度取 0。
+
+        :param latitude: 原点纬度，单位: °
+        :param longitude: 原点经度，单位: °
+        """
+        self.latitude = latitude
+        self.longitude = longitude
+        phi = math.radians(latitude)
+        lam = math.radians(longitude)
+        self._sin_phi = math.sin(phi)
+        self._cos_phi = math.cos(phi)
+        self._sin_lam = math.sin(lam)
+        self._cos_lam = math.cos(lam)
+        self._x0, self._y0, self._z0 = self._to_ecef(latitude, longitude)
+
+    @staticmethod
+    def _to_ecef(latitude, longitude):
+        phi = math.radians(latitude)
+        lam = math.radians(longitude)
+        sin_phi = math.sin(phi)
+        cos_phi = math.cos(phi)
+        n = WGS84_A / math.sqrt(1 - WGS84_E2 * sin_phi * sin_phi)
+        return n * cos_phi * math.cos(lam), n * cos_phi * math.sin(lam), n * (1 - WGS84_E2) * sin_phi
+
+    def to_enu(self, latitude: float, longitude: float):
+        """
+        :return: (east, north)，单位: m
+        """
+        x, y, z = self._to_ecef(latitude, longitude)
+        dx = x - self._x0
+        dy = y - self._y0
+        dz = z - self._z0
+        east = -self._sin_lam * dx + self._cos_lam * dy
+        north = -self._sin_phi * self._cos_lam * dx - self._sin_phi * self._sin_lam * dy + self._cos_phi * dz
+        return east, north
+
+    def to_enu_array(self, latitudes, longitudes):
+        """
+        to_enu() 的数组版本。
+
+        :return: (east, north) 两个 ndarray，单位: m
+        """
+        x, y, z = ecef_array(latitudes, longitudes)
+        dx = x - self._x0
+        dy = y - self._y0
+        dz = z - self._z0
+        east = -self._sin_lam * dx + self._cos_lam * dy
+        north = -self._sin_phi * self._cos_lam * dx - self._sin_phi * self._sin_lam * dy + self._cos_phi * dz
+        return east, north
+
+
+def plane_bearing(east: float, north: float) -> float:
+    # 切平面内的方位角（以正北为 0，顺时针），范围 -180 - 180
+    return math.degrees(math.atan2(east, north))
+
+
+@dataclass
+class SegmentGeometry:
+    start: Point = None        # 航段起点
+    end: Point = None          # 航段终点
+    bearing: float = 0.0       # 航段测地线方位角（起点处），范围 0 - 360
+    length: float = 0.0        # 航段测地线长度，单位: m
+    frame: EnuFrame = None     # 以航段起点为原点的切平面
+    dest_east: float = 0.0     # 终点在切平面中的坐标，单位: m
+    dest_north: float = 0.0
+    unit_east: float = 0.0     # 航段在切平面中的单位方向向量
+    unit_north: float = 0.0
+    plane_length: float = 0.0  # 航段在切平面中的长度，单位: m
+    # 最近一次换算的点，同一 tick 内多次查询同一位置时只换算一次；不参与构造、repr 与比较
+    _cache_latitude: float = field(default=math.nan, init=False, repr=False, compare=False)
+    _cache_longitude: float = field(default=math.nan, init=False, repr=False, compare=False)
+    _cache_east: float = field(default=0.0, init=False, repr=False, compare=False)
+    _cache_north: float = field(default=0.0, init=False, repr=False, compare=False)
+
+    @classmethod
+    def from_points(cls, ge_od: Geod, start: Point, end: Point):
+        """
+        每个航段只计算一次的几何量。
+
+        :param ge_od: pyproj Geod
+        :param start: 航段起点
+        :param end: 航段终点
+        """
+        azimuth, _, _ = ge_od.inv(start.longitude, start.latitude, end.longitude, end.latitude)
+        frame = EnuFrame(start.latitude, start.longitude)
+        dest_east, dest_north = frame.to_enu(end.latitude, end.longitude)
+        plane_length = math.hypot(dest_east, dest_north)
+        unit_east, unit_north = (0.0, 0.0)
+        if plane_length > 0:
+            unit_east, unit_north = dest_east / plane_length, dest_north / plane_length
+        return cls(start=start, end=end, bearing=(azimuth + 360) % 360, length=distance(start, end).meters,
+                   frame=frame, dest_east=dest_east, dest_north=dest_north, unit_east=unit_east,
+                   unit_north=unit_north, plane_length=plane_length)
+
+    def _to_enu(self, point: Point):
+        latitude = point.latitude
+        longitude = point.longitude
+        if latitude != self._cache_latitude or longitude != self._cache_longitude:
+            self._cache_east, self._cache_north = self.frame.to_enu(latitude, longitude)
+            self._cache_latitude = latitude
+            self._cache_longitude = longitude
+        return self._cache_east, self._cache_north
+
+    def to_dest(self, point: Point):
+        """
+        切平面中 point 到航段终点的 (方位角 -180 - 180, 距离 m)。
+        """
+        east, north = self._to_enu(point)
+        d_east = self.dest_east - east
+        d_north = self.dest_north - north
+        return plane_bearing(d_east, d_north), math.hypot(d_east, d_north)
+
+    def along_track(self, point: Point) -> float:
+        """
+        point 在航段方向上相对起点的投影距离，单位: m。
+        """
+        east, north = self._to_enu(point)
+        return east * self.unit_east + north * self.unit_north
+
+
+def validate_enu(latitude: float = 30.8, longitude: float = 122.75, ranges=(100, 1000, 5000, 10000, 20000),
+                 bearings: int = 16):
+    """
+    以测地线为基准，统计切平面在不同距离上的距离误差与方位角误差。
+
+    :param latitude: 原点纬度
+    :param longitude: 原点经度
+    :param ranges: 测试点到原点的距离，单位: m
+    :param bearings: 每个距离上均匀取的方位数
+    :return: [(距离, 最大距离误差 m, 最大方位角误差 °), ...]
+    """
+    ge_od = Geod(ellps='WGS84')
+    frame = EnuFrame(latitude, longitude)
+    result = []
+    for length in ranges:
+        max_distance_error = 0.0
+        max_bearing_error = 0.0
+        for index in range(bearings):
+            azimuth = 360.0 * index / bearings
+            lon, lat, _ = ge_od.fwd(longitude, latitude, azimuth, length)
+            east, north = frame.to_enu(lat, lon)
+            # 与原点的距离、方位，以及该点处回看原点的方位（含子午线收敛）
+            back_azimuth, _, _ = ge_od.inv(lon, lat, longitude, latitude)
+            plane_back = plane_bearing(-east, -north)
+            max_distance_error = max(max_distance_error, abs(math.hypot(east, north) - length))
+            bearing_error = abs((plane_back - back_azimuth + 180) % 360 - 180)
+            max_bearing_error = max(max_bearing_error, bearing_error)
+        result.append((length, max_distance_error, max_bearing_error))
+    return result
+
+
+if __name__ == "__main__":
+    for length, distance_error, bearing_error in validate_enu():
+        print(f"{length:>8.0f} m  distance error {distance_error:.6f} m  bearing error {bearing_error:.6f} deg")
@@ -1,7 +1,8 @@
 import math
 from geopy import Point
 from geopy.distance import distance
-from los.link_list import ListNode
+from los.geometry import SegmentGeometry
+from los.segment_index import SegmentIndex, SegmentMatch
 from pyproj import Geod
 from los.tool import (
     NavigationData,
@@ -13,24 +14,36 @@ from los.tool import (
     NavigationControl,
     to_kn,
     to_mps,
-    calculate_angle_error_180
+    calculate_angle_error_180,
+    set_point,
+    LatDistWindow
 )
 from log.log import logger
 from message.boat_struct import BoatMessage
 
 
 class LOSController:
-    def __init__(self):
+    def __init__(self, fast_geometry: bool = False, auto_rejoin: bool = False, rejoin_distance: float = 100.0):
+        """
+        :param fast_geometry: True 时每个 tick 中与 usv 位置有关的距离、角度在航段起点的切平面中计算，
+                              不再调用测地线求解，误差见 los/geometry.py
+        :param auto_rejoin: True 时侧偏距超过 rejoin_distance 后切换到距离 usv 最近的航段
+        :param rejoin_distance: 触发重新切入的侧偏距，单位: m
+        """
         self.ge_od = Geod(ellps='WGS84')               # 创建一个 WGS84 地理坐标系的对象
-        self.head = ListNode()                         # 链表指针位置
         self.ins_data = InsData()                      # USV 惯导信息
         self.navigation_info = NavigationInfo()        # USV 导航信息
         self.navigation_control = NavigationControl()  # 导航控制信息
         self.single_path_info = SinglePathInfo()       # 当前单条路径信息
-        self.path_info = TaskPath()                    # 维护一个link_list用来存储 航线信息
+        self.path_info = TaskPath()                    # 航线信息，航点保存在 WaypointArray 中
+        self.segment = SegmentGeometry()               # 当前航段的预计算几何量
+        self.fast_geometry = fast_geometry
+        self.auto_rejoin = auto_rejoin
+        self.rejoin_distance = rejoin_distance
+        self.segment_index = None                      # 航段空间索引，首次查询时建立
 
         self.navigation_data = NavigationData()        # los 导航信息
-        self.boat_data = BoatData                      # boat 信息
+        self.boat_data = BoatData()                    # boat 信息
 
         self.lat_dist_pi = 0.0
         self.timeDelay = 5.0
@@ -54,36 +67,40 @@ class LOSController:
 
         self.iUseAccLatMethod = 1
         self.iLength = 10
-        self.fLengthOfLatDist = [0] * 10
-        self.fSumOfLatDist = 0
+        self.lat_dist_window = LatDistWindow(self.iLength)  # 最近 iLength 个侧偏距
         self.fPreLatDist = 0
+        self._usv_point = Point()                           # 每个 tick 原地更新的 usv 位置
 
-    def get_path_info(self, path_pts: list, usv_ins: BoatMessage):
-        # 清空 航线信息
-        self.path_info.path.clear()
+    @property
+    def fLengthOfLatDist(self) -> list:
+        # 最近的侧偏距，下标 0 为最新
+        return self.lat_dist_window.to_list()
 
+    @property
+    def fSumOfLatDist(self) -> float:
+        # 只在用到时累加
+        return self.lat_dist_window.total()
+
+    def get_path_info(self, path_pts: list, usv_ins: BoatMessage):
         # 航线赋值
         self.path_info.state = 1
         self.path_info.end_flag = 0
         self.path_info.PathPointNum = len(path_pts)
 
-        for pts in path_pts:
-            self.path_info.path.append(pts)
-
-        # 插入 usv 位置
+        # 插入 usv 位置，原地替换航点；下标 0 为 usv 位置，首个航段从 path_pts[0] 开始
         usv_point = Point(latitude=usv_ins.latitude, longitude=usv_ins.longitude)
-        self.path_info.path.prepend(usv_point)
-
-        # head -> 头结点
-        self.head = self.path_info.path.head.next
+        self.path_info.path.replace([usv_point, *path_pts], index=0)
+        self.segment_index = None
+        self.single_path_info.usCurTaskNum = 0
 
         # 创建当前航段
         self._update_single_path_info()
 
     def get_usv_info(self, usv_ins: BoatMessage):
         self.navigation_info.tid = usv_ins.usv_id
-        usv_point = Point(latitude=usv_ins.latitude, longitude=usv_ins.longitude)
-        self.ins_data.fPoint = usv_point
+        # 复用同一个 Point，不再每个 tick 新建
+        self._usv_point = set_point(self._usv_point, usv_ins.latitude, usv_ins.longitude)
+        self.ins_data.fPoint = self._usv_point
         self.ins_data.fHeading = usv_ins.heading_angle
 
         self.ins_data.fSpeedK = to_kn(usv_ins.forward_speed)
@@ -95,16 +112,38 @@ class LOSController:
             return
 
         self._get_line_tracking_info()  # 计算路径跟踪相关导航状态信息
+        if self.auto_rejoin and abs(self.boat_data.fLatDist) > self.rejoin_distance:
+            self._rejoin()
+        self._accumulate_lat_dist(self.navigation_info)  # 每个 tick 只记录一次侧偏距
         i_switch = self.if_switch_line(self.single_path_info, self.navigation_info, self.ins_data, self.path_info)
 
         if i_switch == 1:
-            if self.head.next is None:
+            if not self.path_info.path.has_next():
                 return
             else:
                 self._update_single_path_info()
         else:
             self.navigation_control = self._get_line_tracking_control()
 
+    def nearest_segment(self, point: Point) -> SegmentMatch:
+        """
+        查询距离 point 最近的任务航段（不含 usv 初始位置到首个航点的航段）及投影点。
+        """
+        if self.segment_index is None:
+            self.segment_index = SegmentIndex(self.path_info.path.coordinates())
+        return self.segment_index.nearest(point, first=1)
+
+    def _rejoin(self):
+        # 偏离航线过远时切换到最近的航段，并按新航段重新计算导航状态（侧偏距由 tick() 统一记录）
+        match = self.nearest_segment(self.ins_data.fPoint)
+        if match.index < 0 or match.index == self.path_info.path.index:
+            return
+        logger.info(f"侧偏距 {self.boat_data.fLatDist:.1f} m，从航段 {self.path_info.path.index} "
+                    f"切换到最近航段 {match.index}（距离 {match.distance:.1f} m）")
+        self.jump_to_segment(match.index)
+        self._clear_acc_lat_dist()
+        self._get_line_tracking_info()
+
     def get_route_angle(self):
         angle = self.calculate_bearing(self.single_path_info.fFirstPoint, self.single_path_info.fSecondPoint)
         return angle
@@ -277,11 +316,25 @@ class LOSController:
 
     def _update_single_path_info(self):
         self.single_path_info.usCurTaskNum += 1
+        self._load_segment(self.path_info.path.advance())
+
+    def jump_to_segment(self, index: int):
+        """
+        直接切换到指定航段（如偏航后重新切入），航段 index 为 (path[index], path[index + 1])，
+        path[0] 为加载航线时的 usv 位置。
+        """
+        self.single_path_info.usCurTaskNum = index
+        self._load_segment(self.path_info.path.jump_to(index))
+
+    def _load_segment(self, segment):
+        first_point, second_point = segment
         self.single_path_info.ucLineType = 1
-        self.single_path_info.fFirstPoint = self.head.val
-        self.single_path_info.fSecondPoint = self.head.next.val
+        self.single_path_info.fFirstPoint = first_point
+        self.single_path_info.fSecondPoint = second_point
         self.single_path_info.fSpeedK = 10
-        self.head = self.head.next
+        # 航段方位、长度与切平面每个航段只计算一次
+        self.segment = SegmentGeometry.from_points(self.ge_od, self.single_path_info.fFirstPoint,
+                                                   self.single_path_info.fSecondPoint)
 
     def get_route_angle(self):
         angle = self.calculate_bearing(self.single_path_info.fFirstPoint, self.single_path_info.fSecondPoint)
@@ -305,13 +358,12 @@ class LOSController:
         self.navigation_data.fFromPoint = start_point
         self.navigation_data.fDestPoint = end_point
         # 计算航迹线的方向
-        f_azimuth = self.calculate_bearing(self.navigation_data.fFromPoint, self.navigation_data.fDestPoint)
-        f_distance = distance(self.navigation_data.fFromPoint, self.navigation_data.fDestPoint).meters
+        f_azimuth, f_distance = self._segment_bearing_distance(start_point, end_point)
 
-        logger.debug(f"f_azimuth {f_azimuth}")
+        logger.debug("f_azimuth %s", f_azimuth)
 
         f_azimuth = calculate_angle_error_180(f_azimuth, 0.0)  # 转到 -180 - 180 范围内
-        logger.debug(f"f_azimuth {f_azimuth}")
+        logger.debug("f_azimuth %s", f_azimuth)
 
         self.navigation_data.fTrackLineAngle = f_azimuth
         self.navigation_data.fTrackLineDist = f_distance
@@ -322,8 +374,11 @@ class LOSController:
         self.boat_data.fCurBoatYaw = ins_data.fHeading
         self.boat_data.fYawRate = ins_data.fHeadingRate
 
-        f_azimuth_1 = self.calculate_bearing(self.boat_data.stGpsMyBoat, self.navigation_data.fDestPoint)
-        f_distance_1 = distance(self.boat_data.stGpsMyBoat, self.navigation_data.fDestPoint).meters
+        if self.fast_geometry and self.segment.end is end_point:
+            f_azimuth_1, f_distance_1 = self.segment.to_dest(self.boat_data.stGpsMyBoat)
+        else:
+            f_azimuth_1 = self.calculate_bearing(self.boat_data.stGpsMyBoat, self.navigation_data.fDestPoint)
+            f_distance_1 = distance(self.boat_data.stGpsMyBoat, self.navigation_data.fDestPoint).meters
 
         # ang1出来之后是0~360度转到-180到180
         f_azimuth_1 = calculate_angle_error_180(f_azimuth_1, 0)
@@ -347,6 +402,8 @@ class LOSController:
         navigation_info.fToDestAngle = self.boat_data.fToDestAngle
         navigation_info.fToDestDist = self.boat_data.fToDestDist
 
+    def _accumulate_lat_dist(self, navigation_info):
+        # 侧偏距过零时清空积分窗口，并记录本次侧偏距
         if self.fPreLatDist <= 0 <= navigation_info.fLatDist:
             self._clear_acc_lat_dist()
         if self.fPreLatDist >= 0 >= navigation_info.fLatDist:
@@ -354,18 +411,10 @@ class LOSController:
 
         self.fPreLatDist = navigation_info.fLatDist
 
-        self.fSumOfLatDist = 0
-
-        for i in range(self.iLength - 1, 0, -1):
-            self.fLengthOfLatDist[i] = self.fLengthOfLatDist[i - 1]
-            self.fSumOfLatDist += self.fLengthOfLatDist[i]
-
-        self.fLengthOfLatDist[0] = navigation_info.fLatDist
-        self.fSumOfLatDist += self.fLengthOfLatDist[0]
+        self.lat_dist_window.push(navigation_info.fLatDist)
 
     def _clear_acc_lat_dist(self):
-        self.fLengthOfLatDist = [0] * 10
-        self.fSumOfLatDist = 0
+        self.lat_dist_window.clear()
 
     def if_switch_line(self,
                        single_path_info: SinglePathInfo,
@@ -390,12 +439,23 @@ class LOSController:
 
         return i_switch
 
+    def _segment_bearing_distance(self, from_point: Point, dest_point: Point):
+        # 当前航段直接使用预计算值
+        segment = self.segment
+        if segment.start is from_point and segment.end is dest_point:
+            return segment.bearing, segment.length
+        return self.calculate_bearing(from_point, dest_point), distance(from_point, dest_point).meters
+
     def calculate_if_pass_dest(self, from_point: Point, dest_point: Point, ins_data: InsData) -> int:
         i_pass = 0
         usv_point = ins_data.fPoint
 
-        f_path_azimuth = self.calculate_bearing(from_point, dest_point)
-        f_path_distance = distance(from_point, dest_point).meters
+        segment = self.segment
+        if self.fast_geometry and segment.start is from_point and segment.end is dest_point:
+            # 切平面中沿航段方向的投影超过航段长度即视为已通过
+            return 1 if segment.along_track(usv_point) >= segment.plane_length else 0
+
+        f_path_azimuth, f_path_distance = self._segment_bearing_distance(from_point, dest_point)
 
         f_from_to_azimuth = self.calculate_bearing(from_point, usv_point)
         f_from_to_usv_distance = distance(from_point, usv_point).meters
@@ -408,3 +468,41 @@ class LOSController:
             i_pass = 1
 
         return i_pass
+
+
+def benchmark_los(ticks: int = 2000, repeat: int = 5):
+    """
+    比较测地线计算与切平面计算（fast_geometry）下 LOSController.tick() 的单次耗时及输出差异。
+
+    :param ticks: 每轮的 tick 数
+    :param repeat: 重复轮数，取最快一轮
+    """
+    import time
+    import logging
+
+    level = logger.logger.level
+    logger.logger.setLevel(logging.INFO)  # 调试日志不输出，也不再格式化
+    path = [Point(latitude=30.800 + 0.002 * i, longitude=122.750 + 0.002 * i) for i in range(20)]
+    states = [BoatMessage(usv_id=1, latitude=30.7995 + 0.00002 * step, longitude=122.7500 + 0.00002 * step,
+                          heading_angle=45.0, forward_speed=5.0) for step in range(ticks)]
+    outputs = {}
+    for fast_geometry in (False, True):
+        best = float('inf')
+        for _ in range(repeat):
+            los_controller = LOSController(fast_geometry)
+            los_controller.get_path_info(path, states[0])
+            outputs[fast_geometry] = []
+            start = time.perf_counter()
+            for usv_ins in states:
+                los_controller.get_usv_info(usv_ins)
+                los_controller.tick()
+                outputs[fast_geometry].append(los_controller.navigation_control.fTurnAngle)
+            best = min(best, (time.perf_counter() - start) / ticks)
+        print(f"fast_geometry={fast_geometry!s:<5}  {best * 1e6:>8.2f} us/tick  {1 / best:>10.0f} ticks/s")
+    max_error = max(abs(calculate_angle_error_180(a, b)) for a, b in zip(outputs[False], outputs[True]))
+    print(f"max turn angle difference {max_error:.6f} deg")
+    logger.logger.setLevel(level)
+
+
+if __name__ == "__main__":
+    benchmark_los()
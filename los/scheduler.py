@@ -0,0 +1,102 @@
+import math
+import time
+import asyncio
+from dataclasses import dataclass
+
+POLICY_SKIP = 'skip'          # 错过的周期直接跳过，对齐到下一个未到期的截止时刻
+POLICY_CATCH_UP = 'catch_up'  # 错过的周期立即补跑（最多 max_catch_up 次），之后重新对齐
+
+
+@dataclass
+class SchedulerStats:
+    ticks: int = 0                     # 已执行的 tick 数
+    overruns: int = 0                  # tick 结束时已错过下一个截止时刻的次数
+    skipped: int = 0                   # 按策略跳过的周期数
+    max_lateness: float = 0.0          # tick 实际开始时刻相对截止时刻的最大延迟，单位: s
+    total_lateness: float = 0.0        # 延迟累计，单位: s
+    min_period: float = math.inf       # 相邻两次 tick 开始时刻的最小间隔，单位: s
+    max_period: float = 0.0            # 相邻两次 tick 开始时刻的最大间隔，单位: s
+
+    @property
+    def mean_lateness(self) -> float:
+        return self.total_lateness / self.ticks if self.ticks else 0.0
+
+
+class FixedRateScheduler:
+    def __init__(self, frequency_hz: float, policy: str = POLICY_SKIP, max_catch_up: int = 3):
+        """
+        按绝对单调时钟截止时刻以固定频率执行 tick，周期不随 tick 耗时漂移。
+
+        :param frequency_hz: 执行频率，单位: Hz
+        :param policy: 错过截止时刻时的处理策略，POLICY_SKIP 或 POLICY_CATCH_UP
+        :param max_catch_up: POLICY_CATCH_UP 下连续补跑的最大次数
+        """
+        assert frequency_hz > 0, "执行频率必须大于 0"
+        assert policy in (POLICY_SKIP, POLICY_CATCH_UP), f"未知的调度策略: {policy}"
+        self.period = 1.0 / frequency_hz
+        self.policy = policy
+        self.max_catch_up = max_catch_up
+        self.stats = SchedulerStats()
+        self._deadline = None
+        self._last_start = None
+        self._catch_up = 0
+
+    def _begin_tick(self, now):
+        # 记录本次 tick 相对截止时刻的延迟与周期
+        lateness = now - self._deadline
+        self.stats.max_lateness = max(self.stats.max_lateness, lateness)
+        self.stats.total_lateness += lateness
+        if self._last_start is not None:
+            period = now - self._last_start
+            self.stats.min_period = min(self.stats.min_period, period)
+            self.stats.max_period = max(self.stats.max_period, period)
+        self._last_start = now
+
+    def _end_tick(self, now) -> float:
+        # 计算下一个截止时刻，返回需要等待的时间
+        self.stats.ticks += 1
+        self._deadline += self.period
+        if now <= self._deadline:
+            self._catch_up = 0
+            return self._deadline - now
+
+        self.stats.overruns += 1
+        if self.policy == POLICY_CATCH_UP and self._catch_up < self.max_catch_up:
+            self._catch_up += 1
+            return 0.0
+        missed = math.floor((now - self._deadline) / self.period) + 1
+        self.stats.skipped += missed
+        self._deadline += missed * self.period
+        self._catch_up = 0
+        return self._deadline - now
+
+    def run(self, tick, should_stop=None, max_ticks=None):
+        """
+        阻塞执行，直到 should_stop() 返回 True 或执行满 max_ticks 次。
+
+        :param tick: 每个周期调用的函数，无参数
+        :param should_stop: 可选，返回 True 时停止
+        :param max_ticks: 可选，最多执行次数
+        """
+        self._deadline = time.monotonic()
+        while not (should_stop is not None and should_stop()):
+            if max_ticks is not None and self.stats.ticks >= max_ticks:
+                break
+            self._begin_tick(time.monotonic())
+            tick()
+            delay = self._end_tick(time.monotonic())
+            if delay > 0:
+                time.sleep(delay)
+
+    async def run_async(self, tick, should_stop=None, max_ticks=None):
+        """
+        run() 的 asyncio 版本，等待期间让出事件循环。
+        """
+        self._deadline = time.monotonic()
+        while not (should_stop is not None and should_stop()):
+            if max_ticks is not None and self.stats.ticks >= max_ticks:
+                break
+            self._begin_tick(time.monotonic())
+            tick()
+            delay = self._end_tick(time.monotonic())
+            await asyncio.sleep(max(delay, 0.0))
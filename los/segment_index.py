@@ -0,0 +1,194 @@
+import math
+import numpy as np
+from dataclasses import dataclass
+from geopy import Point
+from los.geometry import EnuFrame
+
+
+@dataclass
+class SegmentMatch:
+    index: int = -1          # 航段下标，航段为 (points[index], points[index + 1])
+    distance: float = 0.0    # 查询点到航段的距离，单位: m
+    fraction: float = 0.0    # 投影点在航段上的位置，0 为起点，1 为终点
+    east: float = 0.0        # 投影点在切平面中的坐标，单位: m
+    north: float = 0.0
+    latitude: float = 0.0    # 投影点经纬度（由航段端点按 fraction 线性插值）
+    longitude: float = 0.0
+
+
+class SegmentIndex:
+    def __init__(self, coordinates, cell_size: float = None):
+        """
+        航段的均匀网格空间索引：在以首个航点为原点的切平面中，将每个航段登记到其经过的网格中，
+        查询时由近及远逐圈搜索网格，得到最近航段及投影点。
+
+        :param coordinates: (N, 2) 的 [纬度, 经度] 数组，如 WaypointArray.coordinates()
+        :param cell_size: 网格边长，单位: m，None 时取航段长度的中位数
+        """
+        coordinates = np.asarray(coordinates, dtype=np.float64).reshape(-1, 2)
+        assert len(coordinates) >= 2, "至少需要 2 个航点"
+        self.coordinates = coordinates
+        self.frame = EnuFrame(coordinates[0, 0], coordinates[0, 1])
+        self.east, self.north = self.frame.to_enu_array(coordinates[:, 0], coordinates[:, 1])
+
+        d_east = np.diff(self.east)
+        d_north = np.diff(self.north)
+        lengths = np.hypot(d_east, d_north)
+        self._d_east = d_east
+        self._d_north = d_north
+        self._length2 = lengths * lengths
+        if cell_size is None:
+            cell_size = float(np.median(lengths))
+        self.cell_size = max(cell_size, 1.0)
+
+        self._min_east = float(self.east.min())
+        self._min_north = float(self.north.min())
+        self._max_cell = self._cell_of(float(self.east.max()), float(self.north.max()))
+
+        # 沿航段每半个网格取样登记，样点与航段上任一点的距离不超过 cell_size / 4
+        samples = np.ceil(lengths / (self.cell_size / 2)).astype(np.int64) + 1
+        segments = np.repeat(np.arange(len(lengths), dtype=np.int64), samples)
+        offsets = np.arange(len(segments)) - np.repeat(np.cumsum(samples) - samples, samples)
+        t = offsets / np.repeat(np.maximum(samples - 1, 1), samples)
+        ix = ((self.east[segments] + t * d_east[segments] - self._min_east) // self.cell_size).astype(np.int64)
+        iy = ((self.north[segments] + t * d_north[segments] - self._min_north) // self.cell_size).astype(np.int64)
+        keys = np.unique(np.column_stack((ix, iy, segments)), axis=0)
+        bounds = np.flatnonzero(np.any(np.diff(keys[:, :2], axis=0) != 0, axis=1)) + 1
+        self._cells = {(int(group[0, 0]), int(group[0, 1])): group[:, 2].copy()
+                       for group in np.split(keys, bounds)}
+
+    def __len__(self):
+        return len(self._length2)
+
+    def _cell_of(self, east, north):
+        return (int((east - self._min_east) // self.cell_size),
+                int((north - self._min_north) // self.cell_size))
+
+    def _ring(self, cx, cy, radius):
+        # 与 (cx, cy) 切比雪夫距离恰为 radius、且位于网格范围内的网格中登记的航段
+        cells = self._cells
+        max_x, max_y = self._max_cell
+        if radius == 0:
+            indices = cells.get((cx, cy))
+            return [indices] if indices is not None else []
+        found = []
+        x_range = range(max(cx - radius, 0), min(cx + radius, max_x) + 1)
+        for y in (cy - radius, cy + radius):
+            if 0 <= y <= max_y:
+                for x in x_range:
+                    indices = cells.get((x, y))
+                    if indices is not None:
+                        found.append(indices)
+        y_range = range(max(cy - radius + 1, 0), min(cy + radius - 1, max_y) + 1)
+        for x in (cx - radius, cx + radius):
+            if 0 <= x <= max_x:
+                for y in y_range:
+                    indices = cells.get((x, y))
+                    if indices is not None:
+                        found.append(indices)
+        return found
+
+    def _project(self, indices, east, north):
+        # 点到候选航段的投影比例与距离
+        d_east = self._d_east[indices]
+        d_north = self._d_north[indices]
+        length2 = self._length2[indices]
+        with np.errstate(invalid='ignore', divide='ignore'):
+            t = ((east - self.east[indices]) * d_east + (north - self.north[indices]) * d_north) / length2
+        t = np.clip(np.nan_to_num(t, nan=0.0), 0.0, 1.0)
+        proj_east = self.east[indices] + t * d_east
+        proj_north = self.north[indices] + t * d_north
+        return t, proj_east, proj_north, np.hypot(east - proj_east, north - proj_north)
+
+    def nearest(self, point: Point, first: int = 0) -> SegmentMatch:
+        """
+        查询距离 point 最近的航段。
+
+        :param point: 查询点
+        :param first: 只考虑下标不小于 first 的航段
+        :return: SegmentMatch，没有可选航段时 index 为 -1
+        """
+        east, north = self.frame.to_enu(point.latitude, point.longitude)
+        cx, cy = self._cell_of(east, north)
+        max_x, max_y = self._max_cell
+        # 查询点在网格范围外时，从最近的一圈开始搜索
+        start = max(-cx, cx - max_x, -cy, cy - max_y, 0)
+        stop = max(cx, max_x - cx, cy, max_y - cy)
+
+        best = SegmentMatch(distance=math.inf)
+        for radius in range(start, stop + 1):
+            found = self._ring(cx, cy, radius)
+            if found:
+                indices = np.concatenate(found)
+                if first > 0:
+                    indices = indices[indices >= first]
+                if len(indices):
+                    t, proj_east, proj_north, distances = self._project(indices, east, north)
+                    k = int(np.argmin(distances))
+                    if distances[k] < best.distance:
+                        best = SegmentMatch(index=int(indices[k]), distance=float(distances[k]),
+                                            fraction=float(t[k]), east=float(proj_east[k]),
+                                            north=float(proj_north[k]))
+            # 更近的航段一定登记在已搜索的网格中
+            if best.distance + self.cell_size / 4 <= radius * self.cell_size:
+                break
+
+        if best.index < 0:
+            best.distance = 0.0
+            return best
+        start_point, end_point = self.coordinates[best.index], self.coordinates[best.index + 1]
+        best.latitude, best.longitude = (start_point + best.fraction * (end_point - start_point)).tolist()
+        return best
+
+    def nearest_brute_force(self, point: Point, first: int = 0) -> SegmentMatch:
+        # 逐个航段计算，用于校验 nearest()
+        east, north = self.frame.to_enu(point.latitude, point.longitude)
+        indices = np.arange(first, len(self), dtype=np.int64)
+        if not len(indices):
+            return SegmentMatch()
+        t, proj_east, proj_north, distances = self._project(indices, east, north)
+        k = int(np.argmin(distances))
+        return SegmentMatch(index=int(indices[k]), distance=float(distances[k]), fraction=float(t[k]),
+                            east=float(proj_east[k]), north=float(proj_north[k]))
+
+
+def benchmark_segment_index(num_points: int = 10000, queries: int = 1000):
+    """
+    在蛇形覆盖航线上比较网格索引与逐段计算的最近航段查询耗时，并校验结果一致。
+
+    :param num_points: 航点数
+    :param queries: 查询次数
+    """
+    import time
+
+    rows = 50
+    per_row = num_points // rows
+    coordinates = []
+    for row in range(rows):
+        for column in range(per_row):
+            column = column if row % 2 == 0 else per_row - 1 - column
+            coordinates.append((30.80 + 0.0005 * row, 122.75 + 0.0002 * column))
+    start = time.perf_counter()
+    index = SegmentIndex(coordinates)
+    print(f"{len(index)} segments  build {(time.perf_counter() - start) * 1000:.1f} ms  cell {index.cell_size:.1f} m")
+
+    rng = np.random.default_rng(0)
+    # 航线附近（偏航后重新切入的典型情况）与整个区域内（含航线范围外）的随机查询点
+    near = rng.integers(0, len(coordinates), queries)
+    cases = (("near path", np.asarray(coordinates)[near] + rng.normal(0.0, 0.0003, (queries, 2))),
+             ("whole area", np.column_stack((rng.uniform(30.79, 30.83, queries), rng.uniform(122.74, 122.80, queries)))))
+    for case, query_coordinates in cases:
+        points = [Point(latitude=latitude, longitude=longitude) for latitude, longitude in query_coordinates]
+        for name, query in (("grid", index.nearest), ("brute force", index.nearest_brute_force)):
+            start = time.perf_counter()
+            for point in points:
+                query(point)
+            elapsed = (time.perf_counter() - start) / queries
+            print(f"{case:<10}  {name:<12} {elapsed * 1e6:>8.1f} us/query")
+        mismatches = sum(abs(index.nearest(point).distance - index.nearest_brute_force(point).distance) > 1e-6
+                         for point in points)
+        print(f"{case:<10}  mismatches {mismatches}")
+
+
+if __name__ == "__main__":
+    benchmark_segment_index()
@@ -1,4 +1,4 @@
-from los.link_list import ListNode, LinkList
+from los.waypoint_array import WaypointArray
 from dataclasses import dataclass
 from geopy import Point
 
@@ -42,7 +42,68 @@ def calculate_angle_error_180(angle1: float, angle2: float) -> float:
     return angle_error
 
 
-@dataclass
+def set_point(point: Point, latitude: float, longitude: float) -> Point:
+    """
+    原地更新 geopy Point 的经纬度，结果与 Point(latitude=latitude, longitude=longitude) 相同。
+    超出范围（需要规范化或报错）时返回新建的 Point。
+
+    :param point: 被复用的 Point，不得是 dataclass 字段的共享默认值
+    :param latitude: 纬度
+    :param longitude: 经度
+    :return: 更新后的 Point
+    """
+    latitude = float(latitude)
+    longitude = float(longitude)
+    if not (abs(latitude) <= 90.0 and abs(longitude) <= 180.0):
+        return Point(latitude=latitude, longitude=longitude)
+    point.latitude = latitude
+    point.longitude = longitude
+    return point
+
+
+class LatDistWindow:
+    __slots__ = ('length', '_values', '_zeros', '_head')
+
+    def __init__(self, length: int = 10):
+        """
+        最近 length 个侧偏距的环形缓冲区，push 为 O(1)，不再逐项移位。
+
+        :param length: 窗口长度
+        """
+        self.length = length
+        self._zeros = (0,) * length
+        self._values = list(self._zeros)
+        self._head = 0  # 最新值的下标
+
+    def __getitem__(self, index: int):
+        # 下标 0 为最新值
+        return self._values[(self._head + index) % self.length]
+
+    def push(self, value: float):
+        head = self._head - 1 if self._head else self.length - 1
+        self._values[head] = value
+        self._head = head
+
+    def clear(self):
+        self._values[:] = self._zeros
+        self._head = 0
+
+    def total(self) -> float:
+        # 按从旧到新的顺序累加，与逐项移位累加的结果逐位一致（增减式滑动和会累积舍入误差，结果不同）
+        values = self._values
+        head = self._head
+        length = self.length
+        total = 0
+        for index in range(length - 1, -1, -1):
+            total += values[(head + index) % length]
+        return total
+
+    def to_list(self) -> list:
+        # 从新到旧
+        return [self[index] for index in range(self.length)]
+
+
+@dataclass(slots=True)
 class GPSPoint:
     fLongitude: float  # 经度
     fLatitude: float  # 纬度
@@ -51,7 +112,7 @@ class GPSPoint:
     flag: int
 
 
-@dataclass
+@dataclass(slots=True)
 class NavigationData:
     fFromPoint: Point = Point()  # 上一航点
     fDestPoint: Point = Point()  # 下一航点（目标航点）
@@ -59,7 +120,7 @@ class NavigationData:
     fTrackLineDist: float = 0    # 上一航点到下一航点的距离
 
 
-@dataclass
+@dataclass(slots=True)
 class BoatData:
     stGpsMyBoat: Point = Point  # 无人艇位置
     fCurBoatSpeed: float = 0    # 无人艇当前航速m/s
@@ -76,7 +137,7 @@ class BoatData:
     fCourse: float = 0          # 无人艇航向
 
 
-@dataclass
+@dataclass(slots=True)
 class PathPoint:
     fLongitude: float    # 经度
     fLatitude: float     # 维度
@@ -87,20 +148,20 @@ class PathPoint:
     ucSurroundDire: int  # 环绕方向 1-顺时针 2-逆时针
 
 
-@dataclass
+@dataclass(slots=True)
 class TaskPath:
     roadId: int = 0               # 航路id
     state: int = 0                # 编队航行状态，0无效，1开始，2完成
     end_flag: int = 0             # 所有航点完成结束标志 0-已完成 1-未完成
     PathPointNum: int = 0         # 航线航点数
-    path: LinkList = None
+    path: WaypointArray = None
 
     def __post_init__(self):
         if self.path is None:
-            self.path = LinkList()
+            self.path = WaypointArray()
 
 
-@dataclass
+@dataclass(slots=True)
 class InsData:
     fPoint: Point = Point()    # 经纬度点
     fHeight: float = 0         # 高度：米
@@ -118,7 +179,7 @@ class InsData:
     flag: int = 0
 
 
-@dataclass
+@dataclass(slots=True)
 class NavigationInfo:
     tid: int = 0                     # 编号
     cLineTrackingType: int = 0       # 路径跟踪类型　１－直线　２－曲线
@@ -135,7 +196,7 @@ class NavigationInfo:
     fToCurveDestDist: float = 0      # 相对曲线终点的曲线距离
 
 
-@dataclass
+@dataclass(slots=True)
 class SinglePathInfo:
     usCurTaskNum: int = 0                # 当前任务序号 从1开始
     ucLineType: int = 1                  # 1-直线 2-曲线
@@ -148,7 +209,7 @@ class SinglePathInfo:
     ucSurroundDire: int = 0              # 环绕方向 1-顺时针 2-逆时针
 
 
-@dataclass
+@dataclass(slots=True)
 class NavigationControl:
     flag: int = 0           # flag = 0 不启用N - A策略的输出 保持当前航向和速度; flag = 1 启用N - A策略的输出 改变当前的速度和航向
     fTurnAngle: float = 0   # 导航避障的输出角度，绝对角度，相对于正北方向，0到360度
@@ -0,0 +1,89 @@
+import numpy as np
+from geopy import Point
+
+
+class WaypointArray:
+    def __init__(self, points=None):
+        """
+        以连续数组保存的航点序列，index 为当前航段起点的下标，当前航段为 (points[index], points[index + 1])。
+
+        追加为均摊 O(1)，随机访问与跳转航段为 O(1)，replace() 原地替换整条航线。
+
+        :param points: 初始航点（geopy Point）
+        """
+        self._points = list(points) if points is not None else []
+        self.index = 0
+        self._coordinates = None  # 缓存的 (N, 2) [纬度, 经度] 数组，航点变化时失效
+
+    def __len__(self):
+        return len(self._points)
+
+    def __getitem__(self, item):
+        return self._points[item]
+
+    def __iter__(self):
+        return iter(self._points)
+
+    def append(self, point: Point):
+        self._points.append(point)
+        self._coordinates = None
+
+    def extend(self, points):
+        self._points.extend(points)
+        self._coordinates = None
+
+    def replace(self, points, index: int = 0):
+        """
+        原地替换全部航点并设置当前航段。
+        """
+        self._points[:] = points
+        self.index = index
+        self._coordinates = None
+
+    def clear(self):
+        self._points.clear()
+        self.index = 0
+        self._coordinates = None
+
+    def is_empty(self) -> bool:
+        return not self._points
+
+    @property
+    def segment_count(self) -> int:
+        return max(len(self._points) - 1, 0)
+
+    def segment(self, index: int = None):
+        """
+        :param index: 航段下标，None 为当前航段
+        :return: (起点, 终点)
+        """
+        index = self.index if index is None else index
+        return self._points[index], self._points[index + 1]
+
+    def has_next(self) -> bool:
+        # 当前航段之后是否还有航段
+        return self.index + 2 < len(self._points)
+
+    def jump_to(self, index: int):
+        """
+        跳转到指定航段，返回 (起点, 终点)。
+        """
+        if not 0 <= index < self.segment_count:
+            raise IndexError(f"航段下标 {index} 超出范围 [0, {self.segment_count})")
+        self.index = index
+        return self.segment(index)
+
+    def advance(self):
+        # 进入下一航段，返回 (起点, 终点)
+        return self.jump_to(self.index + 1)
+
+    def coordinates(self) -> np.ndarray:
+        """
+        :return: (N, 2) 的 [纬度, 经度] 数组（只读缓存）
+        """
+        if self._coordinates is None:
+            coordinates = np.array([(point.latitude, point.longitude) for point in self._points],
+                                   dtype=np.float64).reshape(-1, 2)
+            coordinates.setflags(write=False)
+            self._coordinates = coordinates
+        return self._coordinates
@@ -1,21 +1,28 @@
 import os
 import json
 import time
+import asyncio
 import socket
 import threading
-from threading import Lock
+from dataclasses import replace
 from geopy import Point
 from log.log import logger
 from message.server import UDPServer
 from message.client import UDPClient
-from message.parse import parse_packet
+from message.async_transport import AsyncUDPServer, AsyncUDPClient
+from message.conflate import Conflator
+from message.forwarder import Forwarder
+from message.state_store import StateStore, is_updated
 from config.parse_json import ParseJSON
 from convert.coordinate_conversion import GeoConverter
+from convert.grid_lut import GridLUT
 from log.reader import Reader
 from los.los_controller import LOSController
+from los.fleet import FleetController
+from los.fleet_pool import ShardedFleetController
+from los.scheduler import FixedRateScheduler, POLICY_SKIP
 from common import (
-    batch_pixel_to_meter,
-    record_positions,
+    record_physical_positions,
     visualize_positions,
     visualize_positions_scatter
 )
@@ -25,75 +32,117 @@ from message.boat_struct import (
     PathPoint,
     LocalPoint,
     MotionControl,
+    Path,
+    Visualization,
     RectangularTaskArea
 )
 
 
-# 创建一个锁
-lock = Lock()
+TRANSPORT_MODE = 'thread'  # thread: 接收/处理两个阻塞线程; asyncio: 单事件循环
+CONTROL_STR = 'test'       # scatter continuous test fleet
+INGEST_MODE = 'conflate'   # all: 逐帧应用所有 21 号报文; conflate: 每批每艘艇只应用最新一帧
+CONTINUOUS_RATE_HZ = 10    # continuous 模式控制频率
+LOS_RATE_HZ = 2            # test 模式 LOS 控制频率
+CONTROL_TRIGGER = 'timer'  # timer: 按固定频率控制; event: 收到新的 21 号报文后立即控制
+FLEET_SHARDS = 0           # fleet 模式: 0 在控制线程中计算; >0 按 usv_id 分片到多个工作进程并行计算
+PIXEL_SCALE = 20           # test 模式像素坐标的比例尺，单位: m/像素，航点落在该边长的网格上
+USE_GRID_LUT = True        # test 模式: True 用网格查找表换算航点坐标; False 用测地线换算（结果经 converter 的 LRU 缓存）
+CONVERSION_CACHE_SIZE = 4096  # 测地线换算的 LRU 缓存容量，0 为不缓存；重复加载同一航线时跳过测地线计算
+PROJECTION_TOLERANCE = None  # 单位: m; 非 None 时，局部投影在任务区域内的误差不超过该值则用其代替测地线换算
 
 # 在全局作用域创建单例
 singleton_instance: Mission = Mission()
 task_area = RectangularTaskArea()
-converter = GeoConverter(task_area)
+converter = GeoConverter(task_area, cache_size=CONVERSION_CACHE_SIZE)
+if PROJECTION_TOLERANCE is not None:
+    projection_error = converter.enable_fast_projection(PROJECTION_TOLERANCE)
+    logger.info("局部投影最大误差 %.4f m，快速换算%s", projection_error,
+                "已开启" if converter.fast_projection else "未开启（超出容差）")
+# Mission 动态状态（惯导、姿态、可视化标志、航路）的快照存储，读取方无需加锁
+state_store = StateStore()
 
 
 # 创建转发用的 UDP 套接字
 forward_client = UDPClient(host='192.168.2.100', port=4001)
+# 转发线程：接收线程只发布状态并入队，序列化与发送在转发线程中完成
+FORWARD_RATE_HZ = 50  # 4001 端口每秒最多转发的报文数
+forwarder = Forwarder(rate_limits={forward_client.server_address: FORWARD_RATE_HZ})
 
 
-def update_singleton_instance(message, header):
+def update_singleton_instance(parsed_data, header):
+    # 应用一帧报文中的全部消息，每帧只发布一次快照
     global singleton_instance
-    with lock:
-        if hasattr(singleton_instance, 'mission'):
-            if header == 10:
-                singleton_instance.mission.visual_flag = message
-            elif header == 11:
-                singleton_instance.mission.usv_posture = message
-            elif header == 12:
-                singleton_instance.mission.path = message
-            elif header == 21:
-                singleton_instance.mission.boat_message = message
-                # 转发更新后的数据
-                # 将 usv 的惯导数据 转化为 局部坐标
-                x_m, y_m = converter.latlon_to_meters_continuous(Point(latitude=message.latitude,
-                                                                       longitude=message.longitude))
-                heading_degree = message.heading_angle
-                singleton_instance.mission.usv_posture.x_m = x_m
-                singleton_instance.mission.usv_posture.y_m = y_m
-                singleton_instance.mission.usv_posture.heading_degree = heading_degree
-                send_message = singleton_instance.mission.usv_posture.to_string()
-                forward_client.send_message(send_message)  # 转发局部坐标下 usv 的姿态
-
-            # 转发 可视化标志
-            if singleton_instance.mission.visual_flag.feedback_flag == 0:
-                if singleton_instance.mission.visual_flag.visual_flag == 0:
-                    singleton_instance.mission.visual_flag.visual_flag = 1
-                send_message = singleton_instance.mission.visual_flag.to_string()
-                forward_client.send_message(send_message)
-            # 转发 航路信息
-            if singleton_instance.mission.path.point_num != 0 and singleton_instance.mission.path.feedback_flag == 0:
-                send_message = singleton_instance.mission.path.to_string()
-                forward_client.send_message(send_message, True)
-        else:
-            raise AttributeError("singleton_instance is not initialized")
+    if not hasattr(singleton_instance, 'mission'):
+        raise AttributeError("singleton_instance is not initialized")
+    if not parsed_data:
+        return
+
+    # 基于当前快照计算需要替换的字段，构造新对象而不修改已发布的快照
+    snapshot = state_store.snapshot()
+    changes = {}
+    if header == 10:
+        for message in parsed_data:
+            changes['visual_flag'] = message
+            if message.feedback_flag != 0:
+                forwarder.acknowledge(forward_client, Visualization)  # 可视化标志已被接收
+    elif header == 11:
+        changes['usv_posture'] = parsed_data[-1]
+    elif header == 12:
+        for message in parsed_data:
+            changes['path'] = message
+            if message.feedback_flag != 0:
+                forwarder.acknowledge(forward_client, Path)  # 航路信息已被接收
+    elif header == 21:
+        # 按 usv_id 保存每艘艇的最新数据，整帧只复制一次
+        boats = dict(snapshot.boats)
+        for message in parsed_data:
+            boats[message.usv_id] = message
+        message = parsed_data[-1]
+        changes['boat_message'] = message
+        changes['boats'] = boats
+        # 将 usv 的惯导数据 转化为 局部坐标（每帧位置都不同，不使用缓存，避免挤掉航点的缓存结果）
+        x_m, y_m = converter.latlon_to_meters_continuous(Point(latitude=message.latitude,
+                                                               longitude=message.longitude), cache=False)
+        changes['usv_posture'] = replace(snapshot.usv_posture, x_m=x_m, y_m=y_m,
+                                         heading_degree=message.heading_angle)
+
+    visual_flag = changes.get('visual_flag', snapshot.visual_flag)
+    if visual_flag.feedback_flag == 0 and visual_flag.visual_flag == 0:
+        changes['visual_flag'] = replace(visual_flag, visual_flag=1)
+
+    snapshot = state_store.publish(**changes)  # 一次引用替换发布新快照
+
+    # 转发更新后的数据
+    if header == 21:
+        forwarder.submit(forward_client, snapshot.usv_posture)  # 转发局部坐标下 usv 的姿态
+    # 转发 可视化标志：发送一次后等待反馈，超时重发
+    if snapshot.visual_flag.feedback_flag == 0:
+        forwarder.submit_reliable(forward_client, snapshot.visual_flag)
+    # 转发 航路信息：航点列表被整体替换时 version 变化，重新发送
+    # （转发队列持有该列表的引用，id 在等待应答期间不会被复用）
+    if snapshot.path.point_num != 0 and snapshot.path.feedback_flag == 0:
+        forwarder.submit_reliable(forward_client, snapshot.path, True, version=id(snapshot.path.path_points))
+
+
+def ingest_batch(parsed_batch, conflator: Conflator):
+    # 按 INGEST_MODE 应用一批已解析的报文，线程与 asyncio 两种接收方式共用
+    if INGEST_MODE == 'conflate':
+        parsed_batch = conflator.conflate(parsed_batch)  # 丢弃被同一艘艇更新数据取代的旧帧
+    for parsed_data, header in parsed_batch:
+        update_singleton_instance(parsed_data, header)
+        # logger.debug(f"boat_message {state_store.snapshot().boat_message.latitude}")
 
 
 def receive_data(server):
+    conflator = Conflator()
     while True:
-        # 使用阻塞方式接收数据
-        data, client_address = server.receive_message()
-        if data:
-            # logger.info(f"接收到来自 {client_address} 的消息: {data.decode()}")  # log 输出到控制台
-            parsed_data, header = parse_packet(data.decode(), logger)  # 解析报文
-            for message in parsed_data:
-                update_singleton_instance(message, header)
-                # logger.debug(f"singleton_instance {singleton_instance.mission.boat_message.latitude}")
-
+        # 阻塞等待，每次唤醒取出所有待处理的数据报
+        batch = server.receive_batch()
+        # logger.info(f"接收到 {len(batch)} 个数据报, 统计 {server.stats}")  # log 输出到控制台
+        ingest_batch(server.parse_batch(batch), conflator)  # 解析报文并应用
 
-def process_data(client):
-    global singleton_instance
 
+def send_config(client):
     # 读取配置文件
     json_reader = ParseJSON('config/SimConfig.json')
     json_reader.load()
@@ -104,7 +153,115 @@ def process_data(client):
 
     client.send_message(config_data_str, True)
 
-    control_str = 'test'  # scatter continuous test
+
+def visual_ready() -> bool:
+    # 与 模拟器 通讯建立后返回 True
+    return state_store.snapshot().visual_flag.visual_flag != 0
+
+
+def continuous_tick(client):
+    mission: Mission = singleton_instance.mission
+
+    motion_control: MotionControl = mission.motion_control
+    motion_control.usv_id = 1
+    motion_control.motion_control_mode = 3
+    motion_control.throttle_or_speed = 20.0
+    motion_control.rudder_angle_or_heading = 180
+    client.send(motion_control)  # 发送 usv 控制 指令
+
+
+def load_test_path(max_speed) -> list:
+    # 读取测试航线，发布到快照（由接收线程转发），返回地理位置列表
+    json_file_path = os.path.join('.', 'log', 'metrics_20250409_1634', 'metrics.json')  # 读取指标的路径
+    reader = Reader(json_file_path)  # 创建 JSONFileReader 类的实例
+    content = reader.read()  # 读取 JSON 文件内容
+
+    actions = content['actions']  # 提取 pos_list列
+    pos_list = content['pos_list']  # 提取 pos_list列
+    # scatter 的像素坐标，互换 x 和 y 坐标后转为物理位置
+    physical_positions = record_physical_positions(actions, pos_list, PIXEL_SCALE)  # 物理位置
+    if USE_GRID_LUT:
+        # 航点落在固定网格上，直接查表（首次使用时计算并缓存到磁盘）
+        grid_lut = GridLUT.open(task_area, PIXEL_SCALE)
+        latlon = grid_lut.scatter_to_latlon(physical_positions)  # 地理位置 [纬度, 经度]
+        path = grid_lut.scatter_to_continuous(physical_positions)  # 物理位置 左下为原点
+    else:
+        # 重复加载同一航线时命中 converter 的缓存
+        latlon = converter.meters_to_latlon_scatter_array(physical_positions)  # 地理位置 [纬度, 经度]
+        path = converter.latlon_to_meters_continuous_array(latlon)  # 物理位置 左下为原点
+    geographic_positions = [Point(latitude=latitude, longitude=longitude) for latitude, longitude in latlon.tolist()]
+
+    path = [LocalPoint(x_m=x_m, y_m=y_m, speed=max_speed) for x_m, y_m in path.tolist()]
+
+    state_store.publish(path=Path(point_num=len(path), path_points=path))
+    return geographic_positions
+
+
+def prepare_test_mission(max_speed) -> LOSController:
+    geographic_positions = load_test_path(max_speed)
+
+    # 初始化 LOS
+    los_controller = LOSController()
+    usv_ins = state_store.snapshot().boat_message
+    los_controller.get_path_info(geographic_positions, usv_ins)
+    return los_controller
+
+
+def prepare_fleet_mission(max_speed):
+    # 所有艇使用同一条测试航线，之后新出现的艇在首次 tick 时自动加入
+    default_path = load_test_path(max_speed)
+    if FLEET_SHARDS > 0:
+        return ShardedFleetController(FLEET_SHARDS, default_path=default_path).start()
+    return FleetController(default_path=default_path)
+
+
+def los_tick(client, los_controller: LOSController, snapshot=None):
+    mission: Mission = singleton_instance.mission
+    if snapshot is None:
+        snapshot = state_store.snapshot()
+    usv_ins = snapshot.boat_message  # 一致的只读快照，无需加锁
+    # LOS 赋值 和 更新
+    los_controller.get_usv_info(usv_ins)
+    los_controller.tick()
+    navigation_control = los_controller.navigation_control
+
+    logger.error(f"speed: {navigation_control.fForwardVel} "
+                 f"angle: {navigation_control.fTurnAngle} ")
+
+    motion_control: MotionControl = mission.motion_control
+    motion_control.usv_id = 1
+    motion_control.motion_control_mode = 3
+    motion_control.throttle_or_speed = navigation_control.fForwardVel
+    motion_control.rudder_angle_or_heading = navigation_control.fTurnAngle
+    client.send(motion_control)  # 发送 usv 控制 指令
+
+
+def fleet_tick(client, fleet, snapshot=None, only_updated=False):
+    if snapshot is None:
+        snapshot = state_store.snapshot()
+    # 一轮计算所有艇，每艘艇一条 MotionControl
+    controls = fleet.tick(snapshot.boats, only_updated)
+    if controls:
+        client.send_batch(controls)  # 发送 usv 控制 指令
+
+
+def wait_visual_ready():
+    # 阻塞到收到可视化标志，标志更新时立即唤醒
+    snapshot = state_store.snapshot()
+    while not visual_ready():
+        snapshot = state_store.wait_for_update(snapshot, ('visual_flag',))
+
+
+def run_on_update(tick):
+    # 每收到新的 21 号报文立即执行一次 tick(snapshot)，无新数据时不执行
+    snapshot = state_store.snapshot()
+    while True:
+        snapshot = state_store.wait_for_update(snapshot, ('boat_message',))
+        tick(snapshot)
+
+
+def process_data(client):
+    send_config(client)
 
     if hasattr(singleton_instance, 'mission'):
         mission: Mission = singleton_instance.mission
@@ -112,78 +269,143 @@ def process_data(client):
 
         client.send_message(mission.task.task_start_str())  # 发送 任务开始 指令
 
-        while True:  # 与 模拟器 通讯建立后跳出
-            if singleton_instance.mission.visual_flag.visual_flag == 0:
-                time.sleep(0.5)
+        if CONTROL_TRIGGER == 'event':
+            wait_visual_ready()
+        else:
+            while True:  # 与 模拟器 通讯建立后跳出
+                if not visual_ready():
+                    time.sleep(0.5)
+                else:
+                    break
+
+        if CONTROL_STR == 'scatter':
+            pass
+        elif CONTROL_STR == 'continuous':
+            if CONTROL_TRIGGER == 'event':
+                run_on_update(lambda snapshot: continuous_tick(client))
+            else:
+                # 按绝对截止时刻定频执行，周期不受 tick 耗时影响
+                scheduler = FixedRateScheduler(CONTINUOUS_RATE_HZ, POLICY_SKIP)
+                scheduler.run(lambda: continuous_tick(client))
+        elif CONTROL_STR == 'test':
+            los_controller = prepare_test_mission(max_speed)
+
+            if CONTROL_TRIGGER == 'event':
+                run_on_update(lambda snapshot: los_tick(client, los_controller, snapshot))
+            else:
+                scheduler = FixedRateScheduler(LOS_RATE_HZ, POLICY_SKIP)
+                scheduler.run(lambda: los_tick(client, los_controller))
+        elif CONTROL_STR == 'fleet':
+            fleet = prepare_fleet_mission(max_speed)
+
+            if CONTROL_TRIGGER == 'event':
+                # 只计算惯导已更新的艇
+                run_on_update(lambda snapshot: fleet_tick(client, fleet, snapshot, True))
             else:
-                break
+                scheduler = FixedRateScheduler(LOS_RATE_HZ, POLICY_SKIP)
+                scheduler.run(lambda: fleet_tick(client, fleet))
+
+    else:
+        raise AttributeError("singleton_instance is not initialized")
+
+
+async def receive_data_async(server: AsyncUDPServer):
+    conflator = Conflator()
+    while True:
+        # 等待数据报，每次取出队列中所有待处理的数据报
+        batch = await server.receive_batch()
+        ingest_batch(server.parse_batch(batch), conflator)  # 解析报文并应用
+
+
+async def wait_for_update_async(updated: asyncio.Event, last, fields):
+    # asyncio 版 StateStore.wait_for_update()，updated 在每次发布新快照时被置位
+    while True:
+        updated.clear()
+        snapshot = state_store.snapshot()
+        if is_updated(snapshot, last, fields):
+            return snapshot
+        await updated.wait()
+
+
+async def process_data_async(client: AsyncUDPClient):
+    send_config(client)
+
+    # 快照可能在线程池中发布，经 call_soon_threadsafe 回到事件循环置位
+    loop = asyncio.get_running_loop()
+    updated = asyncio.Event()
+    state_store.subscribe(lambda snapshot: loop.call_soon_threadsafe(updated.set))
 
-        if control_str == 'scatter':
+    if hasattr(singleton_instance, 'mission'):
+        mission: Mission = singleton_instance.mission
+        max_speed = 20
+
+        client.send_message(mission.task.task_start_str())  # 发送 任务开始 指令
+
+        snapshot = state_store.snapshot()
+        while not visual_ready():  # 与 模拟器 通讯建立后跳出
+            if CONTROL_TRIGGER == 'event':
+                snapshot = await wait_for_update_async(updated, snapshot, ('visual_flag',))
+            else:
+                await asyncio.sleep(0.5)
+
+        if CONTROL_STR == 'scatter':
             pass
-        elif control_str == 'continuous':
-            while True:
-                mission: Mission = singleton_instance.mission
-
-                motion_control: MotionControl = mission.motion_control
-                motion_control.usv_id = 1
-                motion_control.motion_control_mode = 3
-                motion_control.throttle_or_speed = 20.0
-                motion_control.rudder_angle_or_heading = 180
-                motion_control_str = motion_control.to_string()  # 类型转换
-                client.send_message(motion_control_str)  # 发送 usv 控制 指令
-                time.sleep(0.1)  # sleep 0.1s
-        elif control_str == 'test':
-            json_file_path = os.path.join('.', 'log', 'metrics_20250409_1634', 'metrics.json')  # 读取指标的路径
-            reader = Reader(json_file_path)  # 创建 JSONFileReader 类的实例
-            content = reader.read()  # 读取 JSON 文件内容
-
-            actions = content['actions']  # 提取 pos_list列
-            pos_list = content['pos_list']  # 提取 pos_list列
-            pixel_positions = record_positions(actions, pos_list)  # scatter 的像素坐标
-            swapped_positions = [(y, x) for x, y in pixel_positions]  # # 互换 x 和 y 坐标
-
-            physical_positions = batch_pixel_to_meter(swapped_positions, 20)  # 物理位置
-            geographic_positions = converter.meters_to_latlon_scatter_list(physical_positions)  # 地理位置
-
-            # 初始化 LOS
-            los_controller = LOSController()
-            usv_ins = singleton_instance.mission.boat_message
-            los_controller.get_path_info(geographic_positions, usv_ins)
-
-            path = converter.latlon_to_meters_continuous_list(geographic_positions)  # 物理位置 左下为原点
-            path = [LocalPoint(x_m=point[0], y_m=point[1], speed=max_speed) for point in path]
-
-            singleton_instance.mission.path.point_num = len(path)
-            singleton_instance.mission.path.path_points = path
-
-            while True:
-                mission: Mission = singleton_instance.mission
-                usv_ins = mission.boat_message
-                # LOS 赋值 和 更新
-                los_controller.get_usv_info(usv_ins)
-                los_controller.tick()
-                navigation_control = los_controller.navigation_control
-
-                logger.error(f"speed: {navigation_control.fForwardVel} "
-                             f"angle: {navigation_control.fTurnAngle} ")
-
-                motion_control: MotionControl = mission.motion_control
-                motion_control.usv_id = 1
-                motion_control.motion_control_mode = 3
-                motion_control.throttle_or_speed = navigation_control.fForwardVel
-                motion_control.rudder_angle_or_heading = navigation_control.fTurnAngle
-                motion_control_str = motion_control.to_string()  # 类型转换
-                client.send_message(motion_control_str)  # 发送 usv 控制 指令
-                time.sleep(0.5)  # sleep 0.1s
+        elif CONTROL_STR == 'continuous':
+            if CONTROL_TRIGGER == 'event':
+                snapshot = state_store.snapshot()
+                while True:
+                    snapshot = await wait_for_update_async(updated, snapshot, ('boat_message',))
+                    continuous_tick(client)
+            else:
+                scheduler = FixedRateScheduler(CONTINUOUS_RATE_HZ, POLICY_SKIP)
+                await scheduler.run_async(lambda: continuous_tick(client))
+        elif CONTROL_STR == 'test':
+            # 航路转换耗时较长，放到线程池中执行，不阻塞接收
+            los_controller = await loop.run_in_executor(None, prepare_test_mission, max_speed)
+
+            if CONTROL_TRIGGER == 'event':
+                snapshot = state_store.snapshot()
+                while True:
+                    snapshot = await wait_for_update_async(updated, snapshot, ('boat_message',))
+                    los_tick(client, los_controller, snapshot)
+            else:
+                scheduler = FixedRateScheduler(LOS_RATE_HZ, POLICY_SKIP)
+                await scheduler.run_async(lambda: los_tick(client, los_controller))
+        elif CONTROL_STR == 'fleet':
+            fleet = await loop.run_in_executor(None, prepare_fleet_mission, max_speed)
+
+            if CONTROL_TRIGGER == 'event':
+                snapshot = state_store.snapshot()
+                while True:
+                    snapshot = await wait_for_update_async(updated, snapshot, ('boats',))
+                    fleet_tick(client, fleet, snapshot, True)
+            else:
+                scheduler = FixedRateScheduler(LOS_RATE_HZ, POLICY_SKIP)
+                await scheduler.run_async(lambda: fleet_tick(client, fleet))
 
     else:
         raise AttributeError("singleton_instance is not initialized")
 
 
+async def main_async():
+    # 在同一个事件循环中完成 接收、状态更新、转发 与 LOS 控制
+    # 转发由 forwarder 线程经同步套接字完成，不占用事件循环
+    server = await AsyncUDPServer(host='192.168.2.100', port=3001).start()
+    client = await AsyncUDPClient(host='192.168.2.100', port=2001).start()
+
+    await asyncio.gather(receive_data_async(server), process_data_async(client))
+
+
 def main():
     # 在全局作用域创建单例
-    global singleton_instance
+    global singleton_instance, state_store
     singleton_instance = Singleton.create()
+    state_store = StateStore(singleton_instance.mission)
+    forwarder.start()
+
+    if TRANSPORT_MODE == 'asyncio':
+        asyncio.run(main_async())
+        return
 
     # 创建服务端和客户端对象
     server = UDPServer(host='192.168.2.100', port=3001)
@@ -203,4 +425,4 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
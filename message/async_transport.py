@@ -0,0 +1,135 @@
+import asyncio
+from log.log import logger
+from message import binary_codec
+from message.parse import parse_packet_bytes
+from message.serializer import MessageSerializer, WIRE_TEXT, WIRE_BINARY
+
+
+class _ServerProtocol(asyncio.DatagramProtocol):
+    def __init__(self, server):
+        self.server = server
+
+    def datagram_received(self, data, addr):
+        self.server.on_datagram(data, addr)
+
+    def error_received(self, exc):
+        logger.warning(f"UDP 服务端 {self.server.server_address} 接收异常: {exc}")
+
+
+class _ClientProtocol(asyncio.DatagramProtocol):
+    def __init__(self, client):
+        self.client = client
+
+    def error_received(self, exc):
+        logger.warning(f"UDP 客户端 {self.client.server_address} 发送异常: {exc}")
+
+
+class AsyncUDPServer:
+    def __init__(self, host='127.0.0.1', port=3001, wire_format=WIRE_TEXT, on_message=None):
+        """
+        基于 asyncio DatagramProtocol 的 UDP 服务端，接口与 UDPServer 对应。
+
+        :param host: 绑定地址
+        :param port: 绑定端口
+        :param wire_format: 报文格式，WIRE_TEXT 或 WIRE_BINARY
+        :param on_message: 可选回调 on_message(data, addr)，在事件循环中收到数据报时直接调用；
+                           为 None 时数据报进入队列，由 receive_message() 取出
+        """
+        assert wire_format in (WIRE_TEXT, WIRE_BINARY), f"未知的报文格式: {wire_format}"
+        self.server_address = (host, port)
+        self.wire_format = wire_format
+        self.on_message = on_message
+        self.transport = None
+        self.queue = asyncio.Queue()
+
+    async def start(self):
+        loop = asyncio.get_running_loop()
+        self.transport, _ = await loop.create_datagram_endpoint(lambda: _ServerProtocol(self),
+                                                                local_addr=self.server_address)
+        logger.info(f"UDP 服务端(asyncio)已启动，绑定地址 {self.server_address}，报文格式 {self.wire_format}")
+        return self
+
+    def on_datagram(self, data, addr):
+        if self.on_message is not None:
+            self.on_message(data, addr)
+        else:
+            self.queue.put_nowait((data, addr))
+
+    async def receive_message(self):
+        # 等待下一个数据报，返回 (data, addr)
+        return await self.queue.get()
+
+    async def receive_batch(self, batch_size=64):
+        """
+        等待下一个数据报后，一次取出队列中所有待处理的数据报（最多 batch_size 个），与 UDPServer.receive_batch() 对应。
+
+        :return: [(data, client_address), ...]，空数据报被丢弃
+        """
+        batch = [await self.queue.get()]
+        while len(batch) < batch_size and not self.queue.empty():
+            batch.append(self.queue.get_nowait())
+        return [(data, address) for data, address in batch if data]
+
+    def parse_message(self, data, columnar=False):
+        # 按该端点的报文格式解析报文，返回 (消息列表, 报文头)；columnar 仅对文本格式生效
+        if self.wire_format == WIRE_BINARY:
+            return binary_codec.decode(data)
+        return parse_packet_bytes(data, logger, columnar)
+
+    def parse_batch(self, batch, columnar=False):
+        # 一次解析 receive_batch() 返回的整批数据报，返回 [(消息列表, 报文头), ...]
+        parse = self.parse_message
+        return [parse(data, columnar) for data, _ in batch]
+
+    def send_message(self, message, client_address):
+        if isinstance(message, str):
+            message = message.encode()
+        self.transport.sendto(message, client_address)
+
+    def close(self):
+        if self.transport is not None:
+            self.transport.close()
+        print("服务端关闭。")
+
+
+class AsyncUDPClient:
+    def __init__(self, host='192.168.2.100', port=2001, wire_format=WIRE_TEXT):
+        """
+        基于 asyncio 的 UDP 客户端，发送接口与 UDPClient 一致（发送不阻塞事件循环）。
+        """
+        assert wire_format in (WIRE_TEXT, WIRE_BINARY), f"未知的报文格式: {wire_format}"
+        self.server_address = (host, port)
+        self.wire_format = wire_format
+        self.serializer = MessageSerializer(wire_format)
+        self.transport = None
+
+    async def start(self):
+        loop = asyncio.get_running_loop()
+        self.transport, _ = await loop.create_datagram_endpoint(lambda: _ClientProtocol(self),
+                                                                remote_addr=self.server_address)
+        logger.info(f"UDP 客户端(asyncio)已启动，绑定地址 {self.server_address}，报文格式 {self.wire_format}")
+        return self
+
+    def send_message(self, message, printf=False):
+        # 发送消息到服务端，message 为 str 或已编码的 bytes
+        data = message.encode() if isinstance(message, str) else message
+        self.transport.sendto(data)
+        if printf:
+            logger.info(f"send {message}")
+
+    def send(self, message, printf=False):
+        # 按该端点的报文格式序列化消息对象并发送（transport 会复制数据，因此总是传入 bytes）
+        self.transport.sendto(self.serializer.serialize(message))
+        if printf:
+            logger.info(f"send {message}")
+
+    def send_batch(self, messages, printf=False):
+        for message in messages:
+            self.transport.sendto(self.serializer.serialize(message))
+        if printf:
+            logger.info(f"send {len(messages)} messages")
+
+    def close(self):
+        if self.transport is not None:
+            self.transport.close()
+        print("客户端关闭。")
@@ -0,0 +1,232 @@
+import struct
+from message.boat_struct import (
+    Path,
+    LocalPoint,
+    GPSPoint,
+    UsvPosture,
+    BoatMessage,
+    MotionControl,
+    Visualization
+)
+
+# 定长二进制报文格式，与中括号文本协议并存。
+#
+# 所有字段均为小端序，首字节为报文头（与文本协议的指令代号一致）。
+# 文本报文首字节恒为 '['（0x5B），因此可通过首字节区分两种格式。
+#
+# | 报文头 | 消息          | 布局                                                          |
+# | :----: | :-----------: | :-----------------------------------------------------------: |
+# |   10   | Visualization | B 报文头, B visual_flag, B feedback_flag                      |
+# |   11   | UsvPosture    | B 报文头, d x_m, d y_m, d heading_degree, B feedback_flag     |
+# |   12   | Path          | B 报文头, I point_num, point_num × (d x_m, d y_m, d speed), B feedback_flag |
+# |   21   | BoatMessage   | B 报文头, H usv_num, d 帧时间戳(s), usv_num × 艇记录            |
+# |   22   | MotionControl | B 报文头, 6i, d, d, 2i, waypoints_count × (d lon, d lat, d speed) |
+
+TEXT_FRAME_START = ord('[')
+
+_VISUALIZATION = struct.Struct('<BBB')
+_USV_POSTURE = struct.Struct('<BdddB')
+_PATH_HEAD = struct.Struct('<BI')
+_PATH_POINT = struct.Struct('<ddd')
+_PATH_TAIL = struct.Struct('<B')
+_FLEET_HEAD = struct.Struct('<BHd')
+# usv_id, 12 个浮点状态量, current_state/task_type/target_id/control_mode, 3 个浮点控制量
+_BOAT = struct.Struct('<i12d4i3d')
+_MOTION_CONTROL = struct.Struct('<B6i2d2i')
+_WAYPOINT = struct.Struct('<ddd')
+
+
+def encode_visualization(message: Visualization) -> bytes:
+    return _VISUALIZATION.pack(10, int(message.visual_flag), int(message.feedback_flag))
+
+
+def encode_usv_posture(message: UsvPosture) -> bytes:
+    return _USV_POSTURE.pack(11, message.x_m, message.y_m, message.heading_degree, message.feedback_flag)
+
+
+def encode_path(message: Path) -> bytes:
+    parts = [_PATH_HEAD.pack(12, message.point_num)]
+    parts.extend(_PATH_POINT.pack(point.x_m, point.y_m, point.speed) for point in message.path_points)
+    parts.append(_PATH_TAIL.pack(message.feedback_flag))
+    return b''.join(parts)
+
+
+def encode_boat_messages(boat_messages, timestamp: float = None) -> bytes:
+    """
+    将多艘艇的 BoatMessage 编码为一帧 21 号二进制报文。
+
+    :param boat_messages: BoatMessage 列表
+    :param timestamp: 帧时间戳，单位: s，None 时取第一艘艇的 timestamp
+    :return: 报文 bytes
+    """
+    if timestamp is None:
+        timestamp = boat_messages[0].timestamp if boat_messages else 0.0
+    parts = [_FLEET_HEAD.pack(21, len(boat_messages), timestamp)]
+    for m in boat_messages:
+        parts.append(_BOAT.pack(
+            m.usv_id, m.longitude, m.latitude, m.yaw_angle, m.yaw_velocity, m.yaw_acceleration,
+            m.pitch_angle, m.roll_angle, m.forward_speed, m.forward_acceleration, m.lateral_speed,
+            m.lateral_acceleration, m.heading_angle, m.current_state, m.task_type, m.target_id,
+            m.control_mode, m.current_control_value, m.current_throttle, m.health
+        ))
+    return b''.join(parts)
+
+
+def encode_motion_control(message: MotionControl) -> bytes:
+    parts = [_MOTION_CONTROL.pack(
+        22, message.usv_id, message.task_type, message.target_id, message.route_task_id, message.reserved,
+        message.motion_control_mode, message.throttle_or_speed, message.rudder_angle_or_heading,
+        message.change_in_previous_frame, message.waypoints_count
+    )]
+    parts.extend(_WAYPOINT.pack(wp.longitude, wp.latitude, wp.speed) for wp in message.waypoints)
+    return b''.join(parts)
+
+
+# 消息类型 -> 编码函数
+_ENCODERS = {
+    Visualization: encode_visualization,
+    UsvPosture: encode_usv_posture,
+    Path: encode_path,
+    BoatMessage: lambda message: encode_boat_messages([message]),
+    MotionControl: encode_motion_control,
+}
+
+
+def encode(message) -> bytes:
+    """
+    按消息类型编码为二进制报文。
+
+    :param message: Visualization / UsvPosture / Path / BoatMessage / MotionControl
+    :return: 报文 bytes
+    """
+    encoder = _ENCODERS.get(type(message))
+    if encoder is None:
+        raise TypeError(f"不支持二进制编码的消息类型: {type(message).__name__}")
+    return encoder(message)
+
+
+def _decode_visualization(data):
+    _, visual_flag, feedback_flag = _VISUALIZATION.unpack_from(data)
+    return [Visualization(visual_flag=visual_flag, feedback_flag=feedback_flag)]
+
+
+def _decode_usv_posture(data):
+    _, x_m, y_m, heading_degree, feedback_flag = _USV_POSTURE.unpack_from(data)
+    return [UsvPosture(x_m=x_m, y_m=y_m, heading_degree=heading_degree, feedback_flag=feedback_flag)]
+
+
+def _decode_path(data):
+    _, point_num = _PATH_HEAD.unpack_from(data)
+    start = _PATH_HEAD.size
+    end = start + point_num * _PATH_POINT.size
+    path_points = [LocalPoint(x_m=x_m, y_m=y_m, speed=speed)
+                   for x_m, y_m, speed in _PATH_POINT.iter_unpack(data[start:end])]
+    feedback_flag, = _PATH_TAIL.unpack_from(data, end)
+    return [Path(point_num=point_num, path_points=path_points, feedback_flag=feedback_flag)]
+
+
+def _decode_boat_messages(data):
+    _, usv_num, timestamp = _FLEET_HEAD.unpack_from(data)
+    start = _FLEET_HEAD.size
+    end = start + usv_num * _BOAT.size
+    return [BoatMessage(*values, timestamp) for values in _BOAT.iter_unpack(data[start:end])]
+
+
+def _decode_motion_control(data):
+    values = _MOTION_CONTROL.unpack_from(data)
+    start = _MOTION_CONTROL.size
+    end = start + values[-1] * _WAYPOINT.size
+    waypoints = [GPSPoint(longitude=longitude, latitude=latitude, speed=speed)
+                 for longitude, latitude, speed in _WAYPOINT.iter_unpack(data[start:end])]
+    return [MotionControl(*values[1:], waypoints=waypoints)]
+
+
+# 报文头 -> 解码函数
+_DECODERS = {
+    10: _decode_visualization,
+    11: _decode_usv_posture,
+    12: _decode_path,
+    21: _decode_boat_messages,
+    22: _decode_motion_control,
+}
+
+
+def is_binary_frame(data) -> bool:
+    """
+    判断报文是否为二进制格式（文本报文以 '[' 开头）。
+    """
+    return len(data) > 0 and data[0] != TEXT_FRAME_START
+
+
+def decode(data):
+    """
+    解码二进制报文，返回值与 parse_packet 一致。
+
+    :param data: 接收到的报文，bytes / bytearray / memoryview
+    :return: (解析后的消息列表, 报文头)
+    """
+    header = data[0]
+    decoder = _DECODERS.get(header)
+    if decoder is None:
+        return [], header
+    return decoder(data), header
+
+
+def pack_into(message, buffer, offset: int = 0) -> int:
+    """
+    将消息按二进制格式直接写入预分配的缓冲区，不产生中间 bytes。
+
+    :param message: Visualization / UsvPosture / Path / BoatMessage / MotionControl
+    :param buffer: 可写缓冲区（bytearray），需保证剩余空间不小于 packed_size(message)
+    :param offset: 写入起始位置
+    :return: 写入结束位置
+    """
+    message_type = type(message)
+    if message_type is UsvPosture:
+        _USV_POSTURE.pack_into(buffer, offset, 11, message.x_m, message.y_m, message.heading_degree,
+                               message.feedback_flag)
+        return offset + _USV_POSTURE.size
+    if message_type is MotionControl:
+        _MOTION_CONTROL.pack_into(
+            buffer, offset, 22, message.usv_id, message.task_type, message.target_id, message.route_task_id,
+            message.reserved, message.motion_control_mode, message.throttle_or_speed,
+            message.rudder_angle_or_heading, message.change_in_previous_frame, message.waypoints_count
+        )
+        offset += _MOTION_CONTROL.size
+        for wp in message.waypoints:
+            _WAYPOINT.pack_into(buffer, offset, wp.longitude, wp.latitude, wp.speed)
+            offset += _WAYPOINT.size
+        return offset
+    if message_type is Visualization:
+        _VISUALIZATION.pack_into(buffer, offset, 10, int(message.visual_flag), int(message.feedback_flag))
+        return offset + _VISUALIZATION.size
+    if message_type is Path:
+        _PATH_HEAD.pack_into(buffer, offset, 12, message.point_num)
+        offset += _PATH_HEAD.size
+        for point in message.path_points:
+            _PATH_POINT.pack_into(buffer, offset, point.x_m, point.y_m, point.speed)
+            offset += _PATH_POINT.size
+        _PATH_TAIL.pack_into(buffer, offset, message.feedback_flag)
+        return offset + _PATH_TAIL.size
+    # 其余类型退化为 encode 后复制
+    data = encode(message)
+    buffer[offset:offset + len(data)] = data
+    return offset + len(data)
+
+
+def packed_size(message) -> int:
+    """
+    消息的二进制编码长度（字节）。
+    """
+    message_type = type(message)
+    if message_type is UsvPosture:
+        return _USV_POSTURE.size
+    if message_type is MotionControl:
+        return _MOTION_CONTROL.size + len(message.waypoints) * _WAYPOINT.size
+    if message_type is Visualization:
+        return _VISUALIZATION.size
+    if message_type is Path:
+        return _PATH_HEAD.size + len(message.path_points) * _PATH_POINT.size + _PATH_TAIL.size
+    if message_type is BoatMessage:
+        return _FLEET_HEAD.size + _BOAT.size
+    raise TypeError(f"不支持二进制编码的消息类型: {message_type.__name__}")
@@ -183,9 +183,10 @@ class BoatMessage:
     current_control_value: float = 0.0   # control_mode = 2 时为当前舵角值; control_mode = 3 时为3时为当前期望航向值;
     current_throttle: float = 0.0        # control_mode = 2 时为当前油门值; control_mode = 3 时为3时为当前期望速度值;
     health: float = 0.0                  # 生命值
+    timestamp: float = 0.0               # 采样时刻，单位: s，取自 21 号报文帧时间戳（见 message/timestamp.py）
 
     @staticmethod
-    def from_packet(packet):
+    def from_packet(packet, timestamp: float = 0.0):
         return BoatMessage(
             usv_id=int(packet[0]),
             longitude=float(packet[1]),
@@ -206,7 +207,8 @@ class BoatMessage:
             control_mode=int(packet[16]),
             current_control_value=float(packet[17]),
             current_throttle=float(packet[18]),
-            health=float(packet[19])
+            health=float(packet[19]),
+            timestamp=timestamp
         )
 
     def to_string(self) -> str:
@@ -1,19 +1,42 @@
 import socket
 from log.log import logger
+from message.serializer import MessageSerializer, WIRE_TEXT, WIRE_BINARY
 
 
 class UDPClient:
-    def __init__(self, host='192.168.2.100', port=2001):
+    def __init__(self, host='192.168.2.100', port=2001, wire_format=WIRE_TEXT):
+        assert wire_format in (WIRE_TEXT, WIRE_BINARY), f"未知的报文格式: {wire_format}"
         self.server_address = (host, port)
+        self.wire_format = wire_format
+        self.serializer = MessageSerializer(wire_format)
         self.client_socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
-        logger.info(f"UDP 客户端已启动，绑定地址 {self.server_address}")
+        logger.info(f"UDP 客户端已启动，绑定地址 {self.server_address}，报文格式 {self.wire_format}")
 
     def send_message(self, message, printf=False):
-        # 发送消息到服务端
-        self.client_socket.sendto(message.encode(), self.server_address)
+        # 发送消息到服务端，message 为 str 或已编码的 bytes
+        data = message.encode() if isinstance(message, str) else message
+        self.client_socket.sendto(data, self.server_address)
         if printf:
             logger.info(f"send {message}")
 
+    def send(self, message, printf=False):
+        # 按该端点的报文格式序列化消息对象并发送
+        if self.wire_format == WIRE_BINARY:
+            end = self.serializer.serialize_into(message)
+            with memoryview(self.serializer.buffer) as view:
+                self.client_socket.sendto(view[:end], self.server_address)
+        else:
+            self.client_socket.sendto(self.serializer.serialize(message), self.server_address)
+        if printf:
+            logger.info(f"send {message}")
+
+    def send_batch(self, messages, printf=False):
+        # 批量序列化到同一缓冲区后逐条发送，每条消息一个数据报
+        for datagram in self.serializer.serialize_batch(messages):
+            self.client_socket.sendto(datagram, self.server_address)
+        if printf:
+            logger.info(f"send {len(messages)} messages")
+
     def receive_message(self):
         # 接收服务端的回复
         data, server = self.client_socket.recvfrom(4096)
@@ -21,4 +44,4 @@ class UDPClient:
 
     def close(self):
         self.client_socket.close()
-        print("客户端关闭。")
\ No newline at end of file
+        print("客户端关闭。")
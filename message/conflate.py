@@ -0,0 +1,62 @@
+from dataclasses import dataclass
+from message.boat_struct import BoatMessage
+
+
+@dataclass
+class ConflationStats:
+    frames: int = 0         # 输入的 21 号报文帧数
+    boat_messages: int = 0  # 输入的 BoatMessage 数
+    superseded: int = 0     # 被同批次中同一 usv_id 更新的数据取代而丢弃的数
+    out_of_order: int = 0   # 同批次中晚到但时间戳早于同一 usv_id 已收到数据而丢弃的数
+    stale: int = 0          # 时间戳早于该艇已应用数据（之前的批次）而丢弃的数
+
+
+class Conflator:
+    def __init__(self):
+        """
+        21 号报文的最新值合并：每个批次中每艘艇只保留最新的一条 BoatMessage，保留的数据留在其原来所在的帧中。
+        其他报文（可视化标志、航路反馈等）原样保留，各帧之间的先后顺序不变。
+        """
+        self.stats = ConflationStats()
+        self._last_timestamp = {}  # usv_id -> 已应用数据的时间戳
+
+    def conflate(self, parsed_batch):
+        """
+        :param parsed_batch: [(消息列表, 报文头), ...]，如 UDPServer.parse_batch() 的返回值
+        :return: 合并后的 [(消息列表, 报文头), ...]，21 号报文只保留各艇最新的数据，不再含数据的帧被去掉
+        """
+        latest = {}  # usv_id -> 本批次中该艇最新的 BoatMessage
+        for parsed_data, header in parsed_batch:
+            if header != 21:
+                continue
+            self.stats.frames += 1
+            for message in parsed_data:
+                if not isinstance(message, BoatMessage):
+                    # 列式解码的 FleetFrame 不逐艇合并
+                    continue
+                self.stats.boat_messages += 1
+                previous = latest.get(message.usv_id)
+                if previous is not None:
+                    if message.timestamp < previous.timestamp:
+                        self.stats.out_of_order += 1
+                        continue
+                    self.stats.superseded += 1
+                latest[message.usv_id] = message
+
+        for usv_id, message in list(latest.items()):
+            if message.timestamp < self._last_timestamp.get(usv_id, message.timestamp):
+                self.stats.stale += 1
+                del latest[usv_id]
+                continue
+            self._last_timestamp[usv_id] = message.timestamp
+
+        result = []
+        for parsed_data, header in parsed_batch:
+            if header != 21:
+                result.append((parsed_data, header))
+                continue
+            kept = [message for message in parsed_data
+                    if not isinstance(message, BoatMessage) or latest.get(message.usv_id) is message]
+            if kept:
+                result.append((kept, header))
+        return result
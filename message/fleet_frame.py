@@ -0,0 +1,73 @@
+import numpy as np
+from dataclasses import dataclass, fields
+from message.boat_struct import BoatMessage
+from message.timestamp import decode_timestamp_epoch
+
+
+# BoatMessage 的列式布局：一行对应一艘艇，一列对应 BoatMessage 的一个字段
+BOAT_MESSAGE_DTYPE = np.dtype([
+    (f.name, np.int64 if f.type is int else np.float64) for f in fields(BoatMessage)
+])
+# 21 号报文中每艘艇的字段数（timestamp 列由帧时间戳填充，不在报文中逐艇携带）
+BOAT_FIELD_NUM = 20
+
+
+@dataclass
+class FleetFrame:
+    timestamp: float = 0.0    # 帧时间戳，单位: s（见 message/timestamp.py）
+    boats: np.ndarray = None  # 结构化数组，dtype 为 BOAT_MESSAGE_DTYPE
+
+    def __post_init__(self):
+        if self.boats is None:
+            self.boats = np.empty(0, dtype=BOAT_MESSAGE_DTYPE)
+
+    def __len__(self) -> int:
+        return len(self.boats)
+
+    def column(self, name: str) -> np.ndarray:
+        """
+        获取某一字段的整列数据（视图，不复制）。
+
+        :param name: BoatMessage 字段名，如 'latitude'
+        :return: 该字段的一维数组
+        """
+        return self.boats[name]
+
+    def row(self, usv_id: int) -> BoatMessage:
+        """
+        按艇全局编号取出单艘艇的 BoatMessage。
+
+        :param usv_id: 艇全局编号
+        :return: BoatMessage，不存在时抛出 KeyError
+        """
+        index = np.flatnonzero(self.boats['usv_id'] == usv_id)
+        if index.size == 0:
+            raise KeyError(usv_id)
+        return BoatMessage(*self.boats[index[-1]].tolist())
+
+    def to_boat_messages(self) -> list:
+        """
+        转换为 BoatMessage 列表，与 parse_packet 的输出一致。
+        """
+        return [BoatMessage(*values) for values in self.boats.tolist()]
+
+
+def decode_fleet_frame(fields_list) -> FleetFrame:
+    """
+    将 21 号报文的字段解码为 FleetFrame，整帧只分配一个结构化数组。
+
+    :param fields_list: 按逗号切分后的报文字段（bytes 或 str），首字段为报文头
+    :return: FleetFrame
+    """
+    usv_num = int(fields_list[1])
+    value_num = usv_num * BOAT_FIELD_NUM
+    values = np.fromiter(map(float, fields_list[2:2 + value_num]), dtype=np.float64, count=value_num)
+    values = values.reshape(usv_num, BOAT_FIELD_NUM)
+
+    boats = np.empty(usv_num, dtype=BOAT_MESSAGE_DTYPE)
+    for i, name in enumerate(BOAT_MESSAGE_DTYPE.names[:BOAT_FIELD_NUM]):
+        boats[name] = values[:, i]
+
+    timestamp = decode_timestamp_epoch(fields_list[-1])
+    boats['timestamp'] = timestamp
+    return FleetFrame(timestamp=timestamp, boats=boats)
@@ -0,0 +1,221 @@
+import copy
+import time
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from log.log import logger
+
+
+@dataclass
+class ForwardStats:
+    submitted: int = 0   # 提交的消息数
+    coalesced: int = 0   # 队列中被同类新消息替换的旧消息数
+    sent: int = 0        # 实际发送数
+    throttled: int = 0   # 因限速而等待的次数
+    errors: int = 0      # 发送失败数
+    retransmits: int = 0  # 等待应答超时后的重发次数
+    acked: int = 0        # 收到应答的可靠消息数
+    gave_up: int = 0      # 超过重发上限仍未收到应答的可靠消息数
+
+
+# 可靠消息的状态
+ACK_WAITING = 'waiting'  # 已发送，等待应答
+ACK_DONE = 'acked'       # 已收到应答
+ACK_FAILED = 'failed'    # 重发次数用尽
+
+
+@dataclass
+class _ReliableEntry:
+    client: object
+    message: object
+    printf: bool
+    version: object
+    timeout: float       # 当前等待应答的超时，单位: s，每次重发按 backoff 倍增
+    backoff: float
+    max_retries: int
+    deadline: float      # 超时时刻（time.monotonic）
+    retries: int = 0
+    state: str = ACK_WAITING
+
+
+class Forwarder:
+    def __init__(self, rate_limits=None, name="forwarder"):
+        """
+        转发线程：调用方只把消息放入发送队列，由独立线程完成序列化与网络发送。
+
+        队列按 (目的地址, 消息类型) 合并，新消息替换队列中尚未发送的同类旧消息；
+        每个目的地址可设置最大发送频率。需要对端应答的消息用 submit_reliable() 发送，
+        超时未应答时按指数退避重发。
+
+        :param rate_limits: {(host, port): 每秒最多发送的报文数}，未设置的地址不限速
+        :param name: 线程名
+        """
+        self.rate_limits = dict(rate_limits or {})
+        self.stats = ForwardStats()
+        self._pending = OrderedDict()  # (地址, 合并键) -> (client, message, printf)
+        self._next_send_time = {}      # 地址 -> 允许下一次发送的时刻
+        self._reliable = {}            # (地址, 合并键) -> _ReliableEntry
+        self._condition = threading.Condition()
+        self._running = False
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+
+    def start(self):
+        self._running = True
+        self._thread.start()
+        return self
+
+    def stop(self, timeout=None):
+        with self._condition:
+            self._running = False
+            self._condition.notify()
+        self._thread.join(timeout)
+
+    def set_rate_limit(self, address, max_rate_hz):
+        with self._condition:
+            if max_rate_hz is None:
+                self.rate_limits.pop(address, None)
+            else:
+                self.rate_limits[address] = max_rate_hz
+            self._condition.notify()
+
+    def submit(self, client, message, printf=False, key=None):
+        """
+        放入发送队列，立即返回。消息会被浅复制，调用方之后修改原对象不影响发送内容。
+
+        :param client: UDPClient
+        :param message: 支持 client.send() 的消息对象
+        :param printf: 发送时是否打印日志
+        :param key: 合并键，默认为消息类型；同一目的地址下相同键的消息只保留最新一条
+        """
+        message = copy.copy(message)
+        queue_key = (client.server_address, key if key is not None else type(message))
+        with self._condition:
+            self.stats.submitted += 1
+            if queue_key in self._pending:
+                self.stats.coalesced += 1
+            # 替换后保持原有排队位置，避免高频消息一直被后移
+            self._pending[queue_key] = (client, message, printf)
+            self._condition.notify()
+
+    def submit_reliable(self, client, message, printf=False, key=None, version=None,
+                        timeout=0.5, backoff=2.0, max_retries=5):
+        """
+        发送一次后等待应答，超时按指数退避重发，直到 acknowledge() 或重发次数用尽。
+
+        同一 (目的地址, 合并键) 已有相同 version 且正在等待应答或已应答的可靠消息时不重复发送，
+        因此可以在每次收到报文时调用；version 变化表示内容已更新，重新开始发送流程；
+        重发次数已用尽的消息再次提交时重新开始发送流程（对端可能晚于本端启动）。
+
+        :param client: UDPClient
+        :param message: 支持 client.send() 的消息对象
+        :param printf: 发送时是否打印日志
+        :param key: 合并键，默认为消息类型
+        :param version: 消息版本，用于判断内容是否已更新
+        :param timeout: 首次等待应答的超时，单位: s
+        :param backoff: 每次重发后超时的倍增系数
+        :param max_retries: 最多重发次数
+        """
+        queue_key = (client.server_address, key if key is not None else type(message))
+        with self._condition:
+            entry = self._reliable.get(queue_key)
+            if entry is not None and entry.version == version and entry.state != ACK_FAILED:
+                return
+            message = copy.copy(message)
+            self._reliable[queue_key] = _ReliableEntry(client, message, printf, version, timeout, backoff,
+                                                       max_retries, time.monotonic() + timeout)
+            self.stats.submitted += 1
+            if queue_key in self._pending:
+                self.stats.coalesced += 1
+            self._pending[queue_key] = (client, message, printf)
+            self._condition.notify()
+
+    def acknowledge(self, client, key):
+        """
+        收到对端应答，停止重发。
+
+        :param client: 发送该消息的 UDPClient
+        :param key: 合并键（默认即消息类型）
+        """
+        queue_key = (client.server_address, key)
+        with self._condition:
+            entry = self._reliable.get(queue_key)
+            if entry is None or entry.state == ACK_DONE:
+                return
+            entry.state = ACK_DONE
+            self.stats.acked += 1
+            self._pending.pop(queue_key, None)
+
+    def reliable_state(self, client, key):
+        # 返回可靠消息的状态 ACK_WAITING / ACK_DONE / ACK_FAILED，未提交时为 None
+        with self._condition:
+            entry = self._reliable.get((client.server_address, key))
+            return entry.state if entry is not None else None
+
+    def _schedule_retransmits(self, now):
+        # 超时未应答的消息重新入队；返回下一个超时时刻，无则为 None
+        earliest = None
+        for queue_key, entry in self._reliable.items():
+            if entry.state != ACK_WAITING:
+                continue
+            if entry.deadline <= now:
+                if entry.retries >= entry.max_retries:
+                    entry.state = ACK_FAILED
+                    self.stats.gave_up += 1
+                    logger.warning(f"{type(entry.message).__name__} 重发 {entry.retries} 次仍未收到 "
+                                   f"{queue_key[0]} 的应答，停止重发")
+                    continue
+                entry.retries += 1
+                entry.timeout *= entry.backoff
+                entry.deadline = now + entry.timeout
+                self.stats.retransmits += 1
+                self._pending[queue_key] = (entry.client, entry.message, entry.printf)
+            if earliest is None or entry.deadline < earliest:
+                earliest = entry.deadline
+        return earliest
+
+    def pending(self) -> int:
+        with self._condition:
+            return len(self._pending)
+
+    def _pop_ready(self, now):
+        # 返回第一条目的地址未被限速的消息；均被限速时返回 (None, 最早可发送时刻)
+        earliest = None
+        for queue_key in self._pending:
+            address = queue_key[0]
+            next_time = self._next_send_time.get(address, 0.0)
+            if next_time <= now:
+                item = self._pending.pop(queue_key)
+                rate = self.rate_limits.get(address)
+                if rate:
+                    self._next_send_time[address] = now + 1.0 / rate
+                return item, None
+            if earliest is None or next_time < earliest:
+                earliest = next_time
+        return None, earliest
+
+    def _run(self):
+        while True:
+            with self._condition:
+                while True:
+                    if not self._running:
+                        return
+                    now = time.monotonic()
+                    retransmit_time = self._schedule_retransmits(now)
+                    if self._pending:
+                        item, earliest = self._pop_ready(now)
+                        if item is not None:
+                            break
+                        self.stats.throttled += 1
+                    else:
+                        earliest = None
+                    # 等到 限速解除 或 应答超时 中较早的时刻
+                    if retransmit_time is not None and (earliest is None or retransmit_time < earliest):
+                        earliest = retransmit_time
+                    self._condition.wait(None if earliest is None else max(earliest - now, 0.0))
+            client, message, printf = item
+            try:
+                client.send(message, printf)
+                self.stats.sent += 1
+            except OSError as e:
+                self.stats.errors += 1
+                logger.error(f"转发到 {client.server_address} 失败: {e}")
@@ -1,4 +1,4 @@
-import datetime
+import time
 from message.boat_struct import (
     Path,
     LocalPoint,
@@ -6,6 +6,8 @@ from message.boat_struct import (
     BoatMessage,
     Visualization
 )
+from message.timestamp import decode_timestamp_epoch
+from message.fleet_frame import decode_fleet_frame
 
 
 def parse_packet(packet_str, logger):
@@ -37,19 +39,134 @@ def parse_packet(packet_str, logger):
         path = Path(point_num=point_num, path_points=path_points, feedback_flag=feedback_flag)
         parsed_data.append(path)
     elif header == 21:    # 解析时间戳（最后一个字段是时间戳）
-        timestamp_str = packet_list[-1]
-        timestamp = datetime.datetime.strptime(timestamp_str, "%Y-%m-%d-%H-%M-%S-%f")
-        # 将时间戳替换原来的时间戳字符串
-        packet_list[-1] = timestamp
+        timestamp = decode_timestamp_epoch(packet_list[-1])
         usv_num = int(packet_list[1])
         for i in range(usv_num):
             start_index = 2 + i * 20
             end_index = start_index + 20
             boat_message = packet_list[start_index:end_index]
-            parsed_data.append(BoatMessage.from_packet(boat_message))
+            parsed_data.append(BoatMessage.from_packet(boat_message, timestamp))
 
     # for message in parsed_data:
     #     logger.info(message.__dict__)
 
     return parsed_data, header
 
+
+def _decode_visualization(fields):
+    return [Visualization(visual_flag=int(fields[1]), feedback_flag=int(fields[2]))]
+
+
+def _decode_usv_posture(fields):
+    return [UsvPosture(x_m=float(fields[1]), y_m=float(fields[2]), heading_degree=float(fields[3]))]
+
+
+def _decode_path(fields):
+    point_num = int(fields[1])
+    path_points = []
+    for start_index in range(2, 2 + point_num * 3, 3):
+        path_points.append(LocalPoint(x_m=float(fields[start_index]),
+                                      y_m=float(fields[start_index + 1]),
+                                      speed=float(fields[start_index + 2])))
+    return [Path(point_num=point_num, path_points=path_points, feedback_flag=int(fields[-1]))]
+
+
+def _decode_boat_messages(fields):
+    # 最后一个字段是时间戳，附加到每艘艇的 BoatMessage 上
+    timestamp = decode_timestamp_epoch(fields[-1])
+    usv_num = int(fields[1])
+    parsed_data = []
+    _int, _float = int, float
+    for s in range(2, 2 + usv_num * 20, 20):
+        parsed_data.append(BoatMessage(
+            _int(fields[s]),
+            _float(fields[s + 1]), _float(fields[s + 2]), _float(fields[s + 3]), _float(fields[s + 4]),
+            _float(fields[s + 5]), _float(fields[s + 6]), _float(fields[s + 7]), _float(fields[s + 8]),
+            _float(fields[s + 9]), _float(fields[s + 10]), _float(fields[s + 11]), _float(fields[s + 12]),
+            _int(fields[s + 13]), _int(fields[s + 14]), _int(fields[s + 15]), _int(fields[s + 16]),
+            _float(fields[s + 17]), _float(fields[s + 18]), _float(fields[s + 19]),
+            timestamp
+        ))
+    return parsed_data
+
+
+# 报文头 -> 解码函数
+_DECODERS = {
+    10: _decode_visualization,
+    11: _decode_usv_posture,
+    12: _decode_path,
+    21: _decode_boat_messages,
+}
+
+
+# 列式解码：21 号报文整帧解码为一个 FleetFrame
+_COLUMNAR_DECODERS = {
+    21: decode_fleet_frame,
+}
+
+
+def parse_packet_bytes(data, logger, columnar=False):
+    """
+    直接在接收到的 bytes 上解析报文，可替换 parse_packet(data.decode(), logger)。
+
+    字段保持为 bytes 切片，由 int()/float() 直接转换，不经过 str 解码；
+    按报文头查表分发解码函数。
+
+    :param data: 接收到的报文，bytes / bytearray / memoryview
+    :param logger: 日志对象
+    :param columnar: 为 True 时 21 号报文解码为单个 FleetFrame（NumPy 结构化数组），而非逐艇的 BoatMessage
+    :return: (解析后的消息列表, 报文头)
+    """
+    if isinstance(data, memoryview):
+        data = data.tobytes()
+    # 去掉首尾的 "[" 和 "]"，按逗号切分（C 层完成，不生成 str）
+    fields = data.strip(b'[] \r\n').split(b',')
+    header = int(fields[0])
+    if columnar:
+        decoder = _COLUMNAR_DECODERS.get(header)
+        if decoder is not None:
+            return [decoder(fields)], header
+    decoder = _DECODERS.get(header)
+    if decoder is None:
+        return [], header
+    return decoder(fields), header
+
+
+def _build_fleet_frame(usv_num: int) -> bytes:
+    """
+    构造包含 usv_num 艘艇的 21 号报文，用于测试。
+    """
+    boat = "122.74624105,30.81392600,179.5,0.01,0.0,0.1,-0.2,5.25,0.01,0.02,0.0,179.9,1,0,0,3,180.0,20.0,100.0"
+    boats = ','.join(f"{usv_id},{boat}" for usv_id in range(1, usv_num + 1))
+    return f"[21,{usv_num},{boats},2025-04-09-16-34-12-345]".encode()
+
+
+def benchmark_parse(usv_nums=(1, 10, 100), duration: float = 1.0):
+    """
+    比较 parse_packet 与 parse_packet_bytes 在 21 号报文上的吞吐量（包/秒）。
+
+    :param usv_nums: 每帧的艇数
+    :param duration: 每项测试的大致时长，单位: s
+    """
+    from log.log import logger
+
+    for usv_num in usv_nums:
+        data = _build_fleet_frame(usv_num)
+        assert parse_packet(data.decode(), logger)[0] == parse_packet_bytes(data, logger)[0]
+        assert parse_packet_bytes(data, logger, columnar=True)[0][0].to_boat_messages() == \
+            parse_packet_bytes(data, logger)[0]
+        for name, parse in (("parse_packet", lambda: parse_packet(data.decode(), logger)),
+                            ("parse_packet_bytes", lambda: parse_packet_bytes(data, logger)),
+                            ("columnar", lambda: parse_packet_bytes(data, logger, columnar=True))):
+            count = 0
+            start = time.perf_counter()
+            while time.perf_counter() - start < duration:
+                for _ in range(100):
+                    parse()
+                count += 100
+            rate = count / (time.perf_counter() - start)
+            print(f"{usv_num:>4} boats  {name:<20} {rate:>12.0f} packets/s")
+
+
+if __name__ == "__main__":
+    benchmark_parse()
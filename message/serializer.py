@@ -0,0 +1,173 @@
+from operator import attrgetter
+from dataclasses import dataclass
+from message import binary_codec
+from message.boat_struct import (
+    Path,
+    UsvPosture,
+    BoatMessage,
+    MotionControl,
+    Visualization
+)
+
+WIRE_TEXT = 'text'      # 中括号文本协议
+WIRE_BINARY = 'binary'  # 定长二进制协议，见 message/binary_codec.py
+
+
+@dataclass
+class TextLayout:
+    header: int                    # 报文头
+    fields: tuple                  # 定长字段
+    repeated: str = None           # 变长列表字段名，如 Path.path_points
+    repeated_fields: tuple = ()    # 列表中每个元素的字段
+    tail: tuple = ()               # 变长列表之后的字段
+
+
+# 与各消息 to_string() 输出的字段顺序一致
+TEXT_LAYOUTS = {
+    Visualization: TextLayout(10, ('visual_flag', 'feedback_flag')),
+    UsvPosture: TextLayout(11, ('x_m', 'y_m', 'heading_degree', 'feedback_flag')),
+    Path: TextLayout(12, ('point_num',), 'path_points', ('x_m', 'y_m', 'speed'), ('feedback_flag',)),
+    MotionControl: TextLayout(22, ('usv_id', 'task_type', 'target_id', 'route_task_id', 'reserved',
+                                   'motion_control_mode', 'throttle_or_speed', 'rudder_angle_or_heading',
+                                   'change_in_previous_frame', 'waypoints_count'),
+                              'waypoints', ('longitude', 'latitude', 'speed')),
+    BoatMessage: TextLayout(21, ('usv_id', 'longitude', 'latitude', 'yaw_angle', 'yaw_velocity',
+                                 'yaw_acceleration', 'pitch_angle', 'roll_angle', 'forward_speed',
+                                 'forward_acceleration', 'lateral_speed', 'lateral_acceleration',
+                                 'heading_angle', 'current_state', 'task_type', 'target_id', 'control_mode',
+                                 'current_control_value', 'current_throttle', 'health')),
+}
+
+
+def _tuple_getter(names: tuple):
+    # attrgetter 单字段时返回标量，这里统一返回元组
+    if len(names) == 1:
+        getter = attrgetter(names[0])
+        return lambda obj: (getter(obj),)
+    return attrgetter(*names)
+
+
+def compile_text_serializer(layout: TextLayout):
+    """
+    按消息布局预编译 bytes 格式模板，返回 message -> bytes 的函数。
+
+    输出与 to_string().encode() 逐字节一致：%r 对 int/float 等同于 str()，
+    因此字段需为 Python 内置数值类型。
+    """
+    head_format = b'[' + b', '.join([b'%d' % layout.header] + [b'%r'] * len(layout.fields))
+    head_getter = _tuple_getter(layout.fields)
+
+    if layout.repeated is None:
+        head_format += b']'
+        return lambda message: head_format % head_getter(message)
+
+    items_getter = attrgetter(layout.repeated)
+    item_format = b', %r' * len(layout.repeated_fields)
+    item_getter = _tuple_getter(layout.repeated_fields)
+    tail_format = b', %r' * len(layout.tail) + b']'
+    tail_getter = _tuple_getter(layout.tail) if layout.tail else (lambda message: ())
+
+    # 列表为空时（如无航点的 MotionControl）一次格式化完成
+    empty_format = head_format + tail_format
+
+    def serialize(message) -> bytes:
+        items = items_getter(message)
+        if not items:
+            return empty_format % (head_getter(message) + tail_getter(message))
+        parts = [head_format % head_getter(message)]
+        for item in items:
+            parts.append(item_format % item_getter(item))
+        parts.append(tail_format % tail_getter(message))
+        return b''.join(parts)
+
+    return serialize
+
+
+_TEXT_SERIALIZERS = {message_type: compile_text_serializer(layout) for message_type, layout in TEXT_LAYOUTS.items()}
+
+
+class MessageSerializer:
+    def __init__(self, wire_format=WIRE_TEXT, buffer_size=65536):
+        """
+        消息序列化器：每种消息类型的格式只编译一次，并写入可复用的发送缓冲区。
+
+        :param wire_format: 报文格式，WIRE_TEXT 或 WIRE_BINARY
+        :param buffer_size: 发送缓冲区初始大小（字节），不足时自动扩容
+        """
+        assert wire_format in (WIRE_TEXT, WIRE_BINARY), f"未知的报文格式: {wire_format}"
+        self.wire_format = wire_format
+        self.buffer = bytearray(buffer_size)
+
+    def serialize(self, message) -> bytes:
+        """
+        序列化单条消息。
+        """
+        if self.wire_format == WIRE_BINARY:
+            return binary_codec.encode(message)
+        serializer = _TEXT_SERIALIZERS.get(type(message))
+        if serializer is None:
+            return message.to_string().encode()
+        return serializer(message)
+
+    def _reserve(self, offset: int, size: int):
+        # 空间不足时换一块更大的缓冲区；已导出的 memoryview 仍引用旧缓冲区，不受影响
+        if offset + size > len(self.buffer):
+            new_buffer = bytearray(max(2 * len(self.buffer), offset + size))
+            new_buffer[:offset] = self.buffer[:offset]
+            self.buffer = new_buffer
+
+    def serialize_into(self, message, offset: int = 0) -> int:
+        """
+        将消息写入缓冲区 self.buffer 的 offset 处。
+
+        :return: 写入结束位置
+        """
+        if self.wire_format == WIRE_BINARY:
+            self._reserve(offset, binary_codec.packed_size(message))
+            return binary_codec.pack_into(message, self.buffer, offset)
+        data = self.serialize(message)
+        end = offset + len(data)
+        self._reserve(offset, len(data))
+        self.buffer[offset:end] = data
+        return end
+
+    def serialize_batch(self, messages) -> list:
+        """
+        将多条消息依次写入缓冲区，返回每条报文对应的 memoryview（一条报文一个数据报）。
+
+        返回的视图在下一次写入前有效。
+        """
+        bounds = []
+        offset = 0
+        for message in messages:
+            end = self.serialize_into(message, offset)
+            bounds.append((offset, end))
+            offset = end
+        view = memoryview(self.buffer)
+        return [view[start:end] for start, end in bounds]
+
+
+def benchmark_serializer(number: int = 100000):
+    """
+    比较 to_string().encode() 与预编译序列化器的耗时。
+    """
+    import timeit
+
+    motion_control = MotionControl(usv_id=1, motion_control_mode=3,
+                                   throttle_or_speed=9.723456789123, rudder_angle_or_heading=187.12345678901)
+    usv_posture = UsvPosture(x_m=1234.5678901234, y_m=987.65432109876, heading_degree=179.98765432)
+    text = MessageSerializer(WIRE_TEXT)
+    binary = MessageSerializer(WIRE_BINARY)
+
+    for message in (motion_control, usv_posture):
+        assert text.serialize(message) == message.to_string().encode()
+        for name, func in (("to_string().encode()", lambda: message.to_string().encode()),
+                           ("text serialize", lambda: text.serialize(message)),
+                           ("text serialize_into", lambda: text.serialize_into(message)),
+                           ("binary serialize_into", lambda: binary.serialize_into(message))):
+            cost = timeit.timeit(func, number=number) / number
+            print(f"{type(message).__name__:<14} {name:<22} {cost * 1e6:8.3f} us")
+
+
+if __name__ == "__main__":
+    benchmark_serializer()
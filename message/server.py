@@ -1,17 +1,128 @@
+import sys
 import socket
+import select
+import struct
+from dataclasses import dataclass
 from log.log import logger
+from message import binary_codec
+from message.parse import parse_packet_bytes
+from message.serializer import WIRE_TEXT, WIRE_BINARY
+
+# Linux 上开启后，每个数据报的辅助数据中带有该套接字累计因缓冲区满而丢弃的数据报数
+SO_RXQ_OVFL = getattr(socket, 'SO_RXQ_OVFL', 40 if sys.platform.startswith('linux') else None)
+_OVFL_COUNTER = struct.Struct('=I')
+
+
+@dataclass
+class ReceiveStats:
+    batches: int = 0         # 批次数（每次唤醒一次）
+    datagrams: int = 0       # 收到的数据报数（含被截断的）
+    bytes: int = 0           # 收到的字节数
+    truncated: int = 0       # 超过 max_datagram_size 被截断而丢弃的数据报数
+    empty: int = 0           # 长度为 0 而丢弃的数据报数
+    kernel_dropped: int = 0  # 内核接收缓冲区满而丢弃的数据报数（仅 Linux）
+    max_batch: int = 0       # 单批最多数据报数
 
 
 class UDPServer:
-    def __init__(self, host='127.0.0.1', port=3001):
+    def __init__(self, host='127.0.0.1', port=3001, wire_format=WIRE_TEXT,
+                 recv_buffer_size=4 * 1024 * 1024, max_datagram_size=65507, batch_size=64):
+        """
+        :param host: 绑定地址
+        :param port: 绑定端口
+        :param wire_format: 报文格式，WIRE_TEXT 或 WIRE_BINARY
+        :param recv_buffer_size: 内核接收缓冲区 SO_RCVBUF 大小（字节），None 时使用系统默认值
+        :param max_datagram_size: 单个数据报的最大长度，超过视为截断
+        :param batch_size: receive_batch() 单次最多取出的数据报数，也是预分配缓冲区的个数
+        """
+        assert wire_format in (WIRE_TEXT, WIRE_BINARY), f"未知的报文格式: {wire_format}"
         self.server_address = (host, port)
+        self.wire_format = wire_format
+        self.max_datagram_size = max_datagram_size
         self.server_socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        if recv_buffer_size is not None:
+            self.server_socket.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, recv_buffer_size)
         self.server_socket.bind(self.server_address)
-        logger.info(f"UDP 服务端已启动，绑定地址 {self.server_address}")
+
+        # 批量接收：预分配缓冲区，recv 直接写入，不再逐包分配 bytes
+        self._buffers = [bytearray(max_datagram_size + 1) for _ in range(batch_size)]
+        self._views = [memoryview(buffer) for buffer in self._buffers]
+        self._use_recvmsg = hasattr(self.server_socket, 'recvmsg_into')
+        self._ancbufsize = 0
+        if self._use_recvmsg and SO_RXQ_OVFL is not None:
+            try:
+                self.server_socket.setsockopt(socket.SOL_SOCKET, SO_RXQ_OVFL, 1)
+                self._ancbufsize = socket.CMSG_SPACE(_OVFL_COUNTER.size)
+            except OSError:
+                pass
+        self.stats = ReceiveStats()
+
+        rcvbuf = self.server_socket.getsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF)
+        logger.info(f"UDP 服务端已启动，绑定地址 {self.server_address}，报文格式 {self.wire_format}，"
+                    f"接收缓冲区 {rcvbuf} 字节")
 
     def receive_message(self):
         # 使用阻塞方式接收数据
-        return self.server_socket.recvfrom(4096)
+        return self.server_socket.recvfrom(self.max_datagram_size)
+
+    def _receive_one(self, index):
+        # 非阻塞接收一个数据报到第 index 个缓冲区，返回 (长度, 地址, 是否截断)；无数据时抛出 BlockingIOError
+        if self._use_recvmsg:
+            nbytes, ancdata, msg_flags, address = self.server_socket.recvmsg_into(
+                [self._buffers[index]], self._ancbufsize, socket.MSG_DONTWAIT)
+            for level, kind, data in ancdata:
+                if level == socket.SOL_SOCKET and kind == SO_RXQ_OVFL and len(data) >= _OVFL_COUNTER.size:
+                    # 计数从套接字创建起累计
+                    self.stats.kernel_dropped = _OVFL_COUNTER.unpack_from(data)[0]
+            truncated = bool(msg_flags & socket.MSG_TRUNC) or nbytes > self.max_datagram_size
+            return nbytes, address, truncated
+        nbytes, address = self.server_socket.recvfrom_into(self._buffers[index], self.max_datagram_size + 1,
+                                                           getattr(socket, 'MSG_DONTWAIT', 0))
+        return nbytes, address, nbytes > self.max_datagram_size
+
+    def receive_batch(self, timeout=None):
+        """
+        等待套接字可读后，一次取出所有待处理的数据报（最多 batch_size 个）。
+
+        :param timeout: 最长等待时间，单位: s，None 为一直等待
+        :return: [(memoryview, client_address), ...]，视图指向预分配缓冲区，下一次调用前有效；
+                 被截断的数据报计入 stats.truncated、空数据报计入 stats.empty，均丢弃
+        """
+        readable, _, _ = select.select([self.server_socket], [], [], timeout)
+        if not readable:
+            return []
+
+        batch = []
+        for index in range(len(self._buffers)):
+            try:
+                nbytes, address, truncated = self._receive_one(index)
+            except (BlockingIOError, InterruptedError):
+                break
+            self.stats.datagrams += 1
+            self.stats.bytes += nbytes
+            if truncated:
+                self.stats.truncated += 1
+                logger.warning(f"丢弃来自 {address} 的超长数据报（大于 {self.max_datagram_size} 字节）")
+                continue
+            if nbytes == 0:
+                self.stats.empty += 1
+                continue
+            batch.append((self._views[index][:nbytes], address))
+
+        self.stats.batches += 1
+        self.stats.max_batch = max(self.stats.max_batch, len(batch))
+        return batch
+
+    def parse_message(self, data, columnar=False):
+        # 按该端点的报文格式解析报文，返回 (消息列表, 报文头)；columnar 仅对文本格式生效
+        if self.wire_format == WIRE_BINARY:
+            return binary_codec.decode(data)
+        return parse_packet_bytes(data, logger, columnar)
+
+    def parse_batch(self, batch, columnar=False):
+        # 一次解析 receive_batch() 返回的整批数据报，返回 [(消息列表, 报文头), ...]
+        parse = self.parse_message
+        return [parse(data, columnar) for data, _ in batch]
 
     def send_message(self, message, client_address):
         # 使用阻塞方式发送数据
@@ -26,4 +137,4 @@ class UDPServer:
 
     def close(self):
         self.server_socket.close()
-        print("服务端关闭。")
\ No newline at end of file
+        print("服务端关闭。")
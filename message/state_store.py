@@ -0,0 +1,101 @@
+import threading
+from dataclasses import dataclass, field, replace
+from message.boat_struct import (
+    Path,
+    Mission,
+    UsvPosture,
+    BoatMessage,
+    Visualization
+)
+
+
+@dataclass(frozen=True)
+class MissionSnapshot:
+    seq: int = 0                       # 版本号，每次发布加 1
+    boat_message: BoatMessage = None   # 船只信息
+    usv_posture: UsvPosture = None     # 物理位置
+    visual_flag: Visualization = None  # 可视化标志
+    path: Path = None                  # 航路信息
+    boats: dict = field(default_factory=dict)  # usv_id -> 该艇最新的 BoatMessage，随每次更新整体替换
+
+
+def is_updated(snapshot: MissionSnapshot, last: MissionSnapshot, fields=None) -> bool:
+    """
+    snapshot 相比 last 是否更新了指定字段（fields 为 None 时任意字段）。
+    """
+    if snapshot.seq == last.seq:
+        return False
+    if fields is None:
+        return True
+    return any(getattr(snapshot, name) is not getattr(last, name) for name in fields)
+
+
+class StateStore:
+    def __init__(self, mission: Mission = None):
+        """
+        Mission 动态状态的快照存储。
+
+        写入方通过 publish() 生成新的快照并整体替换引用；读取方通过 snapshot() 直接取得当前快照，
+        无需加锁，且同一快照中的各字段彼此一致。快照及其中的消息对象发布后不得再修改，
+        更新时应构造新对象（如 dataclasses.replace）。
+
+        :param mission: 用于初始化首个快照的 Mission
+        """
+        mission = mission if mission is not None else Mission()
+        self._snapshot = MissionSnapshot(
+            seq=0,
+            boat_message=mission.boat_message,
+            usv_posture=mission.usv_posture,
+            visual_flag=mission.visual_flag,
+            path=mission.path
+        )
+        self._write_lock = threading.Lock()  # 仅在多个写入方之间互斥，读取方不加锁
+        self._condition = threading.Condition(self._write_lock)  # 新快照发布时唤醒 wait_for_update()
+        self._listeners = []
+
+    def snapshot(self) -> MissionSnapshot:
+        """
+        获取当前快照（一次引用读取）。
+        """
+        return self._snapshot
+
+    def publish(self, **changes) -> MissionSnapshot:
+        """
+        以当前快照为基础替换指定字段，发布新快照。
+
+        :param changes: 需要替换的字段，如 boat_message=..., usv_posture=...
+        :return: 新快照
+        """
+        with self._condition:
+            snapshot = replace(self._snapshot, seq=self._snapshot.seq + 1, **changes)
+            self._snapshot = snapshot
+            self._condition.notify_all()
+        for listener in self._listeners:
+            listener(snapshot)
+        return snapshot
+
+    def subscribe(self, listener):
+        """
+        注册回调 listener(snapshot)，每次发布新快照后在写入方线程中调用。
+        asyncio 模式下可用于设置 asyncio.Event。
+        """
+        self._listeners.append(listener)
+
+    def wait_for_update(self, last: MissionSnapshot, fields=None, timeout=None) -> MissionSnapshot:
+        """
+        阻塞等待，直到发布了与 last 相比指定字段已更新的快照。
+
+        :param last: 调用方上一次处理的快照
+        :param fields: 关心的字段名，如 ('boat_message',)；None 表示任意字段
+        :param timeout: 最长等待时间，单位: s，None 为一直等待
+        :return: 当前快照；超时返回时可能与 last 相同
+        """
+        with self._condition:
+            self._condition.wait_for(lambda: is_updated(self._snapshot, last, fields), timeout)
+            return self._snapshot
+
+    def changed_since(self, seq: int) -> bool:
+        """
+        自版本号 seq 之后是否发布过新快照。
+        """
+        return self._snapshot.seq != seq
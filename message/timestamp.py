@@ -0,0 +1,81 @@
+import datetime
+from functools import lru_cache
+
+# 21 号报文时间戳格式: yyyy-MM-dd-HH-mm-ss-fff，各字段定宽
+TIMESTAMP_FORMAT = "%Y-%m-%d-%H-%M-%S-%f"
+
+
+@lru_cache(maxsize=8)
+def _day_epoch(year: int, month: int, day: int) -> int:
+    """
+    计算某日 00:00:00 相对 1970-01-01 的秒数（公历，按 UTC 解释）。
+    同一天内的报文命中缓存，不重复计算。
+    """
+    # days_from_civil，见 http://howardhinnant.github.io/date_algorithms.html
+    year -= month <= 2
+    era = (year if year >= 0 else year - 399) // 400
+    yoe = year - era * 400
+    doy = (153 * (month + (-3 if month > 2 else 9)) + 2) // 5 + day - 1
+    doe = yoe * 365 + yoe // 4 - yoe // 100 + doy
+    return (era * 146097 + doe - 719468) * 86400
+
+
+def _split_fields(timestamp):
+    # 按定宽位置切片，不经过正则与 locale
+    timestamp = timestamp.strip()
+    fraction = timestamp[20:]
+    microsecond = int(fraction) * 10 ** (6 - len(fraction)) if fraction else 0
+    return (int(timestamp[0:4]), int(timestamp[5:7]), int(timestamp[8:10]),
+            int(timestamp[11:13]), int(timestamp[14:16]), int(timestamp[17:19]), microsecond)
+
+
+def decode_timestamp(timestamp) -> datetime.datetime:
+    """
+    解码 21 号报文时间戳，结果与 datetime.strptime(timestamp, TIMESTAMP_FORMAT) 一致。
+
+    :param timestamp: 时间戳，str 或 bytes，如 '2025-04-09-16-34-12-345'
+    :return: datetime（无时区）
+    """
+    return datetime.datetime(*_split_fields(timestamp))
+
+
+def decode_timestamp_epoch(timestamp) -> float:
+    """
+    解码 21 号报文时间戳为浮点秒数。
+
+    时间戳按 UTC 解释，不做时区与夏令时换算，因此随时间戳严格单调，
+    可直接用作控制回路的采样时刻。
+
+    :param timestamp: 时间戳，str 或 bytes，如 '2025-04-09-16-34-12-345'
+    :return: 相对 1970-01-01 00:00:00 的秒数
+    """
+    year, month, day, hour, minute, second, microsecond = _split_fields(timestamp)
+    return _day_epoch(year, month, day) + hour * 3600 + minute * 60 + second + microsecond * 1e-6
+
+
+def epoch_to_datetime(epoch: float) -> datetime.datetime:
+    """
+    decode_timestamp_epoch 的逆变换，返回无时区 datetime。
+    """
+    return datetime.datetime(1970, 1, 1) + datetime.timedelta(seconds=epoch)
+
+
+def benchmark_timestamp(number: int = 100000):
+    """
+    比较 strptime 与定宽解码的耗时。
+    """
+    import timeit
+
+    text = "2025-04-09-16-34-12-345"
+    data = text.encode()
+    assert decode_timestamp(text) == datetime.datetime.strptime(text, TIMESTAMP_FORMAT)
+    assert epoch_to_datetime(decode_timestamp_epoch(data)) == decode_timestamp(data)
+    for name, func in (("strptime", lambda: datetime.datetime.strptime(text, TIMESTAMP_FORMAT)),
+                       ("decode_timestamp", lambda: decode_timestamp(data)),
+                       ("decode_timestamp_epoch", lambda: decode_timestamp_epoch(data))):
+        cost = timeit.timeit(func, number=number) / number
+        print(f"{name:<24} {cost * 1e6:8.3f} us")
+
+
+if __name__ == "__main__":
+    benchmark_timestamp()
@@ -0,0 +1,32 @@
+from message.boat_struct import BoatMessage, Visualization
+from message.conflate import Conflator
+
+
+def _boat(usv_id, timestamp):
+    return BoatMessage(usv_id=usv_id, timestamp=timestamp)
+
+
+def test_kept_frames_stay_at_original_position():
+    old_1, new_1, boat_2 = _boat(1, 1.0), _boat(1, 2.0), _boat(2, 1.0)
+    flag = Visualization(visual_flag=1, feedback_flag=1)
+    batch = [([old_1, boat_2], 21), ([new_1], 21), ([flag], 10)]
+
+    conflator = Conflator()
+    result = conflator.conflate(batch)
+
+    assert result == [([boat_2], 21), ([new_1], 21), ([flag], 10)]
+    assert result[0][0][0] is boat_2 and result[1][0][0] is new_1
+    assert conflator.stats.superseded == 1 and conflator.stats.out_of_order == 0
+
+
+def test_out_of_order_and_stale_are_counted_separately():
+    conflator = Conflator()
+    conflator.conflate([([_boat(1, 5.0)], 21)])
+
+    late = _boat(2, 1.0)
+    result = conflator.conflate([([_boat(1, 4.0)], 21), ([_boat(2, 2.0)], 21), ([late], 21)])
+
+    assert [[message.timestamp for message in messages] for messages, _ in result] == [[2.0]]
+    assert conflator.stats.stale == 1
+    assert conflator.stats.out_of_order == 1
+    assert conflator.stats.superseded == 0
@@ -0,0 +1,50 @@
+import numpy as np
+import main
+from convert.coordinate_conversion import GeoConverter, RectangularTaskArea
+
+
+class _ShiftedTaskArea(RectangularTaskArea):
+    top_latitude: float = 30.820000
+
+
+def test_repeated_mission_load_hits_cache(monkeypatch):
+    converter = GeoConverter(RectangularTaskArea(), cache_size=16)
+    monkeypatch.setattr(main, 'converter', converter)
+    monkeypatch.setattr(main, 'USE_GRID_LUT', False)
+
+    first = main.load_test_path(3.0)
+    stats = converter.cache.stats
+    assert (stats.hits, stats.misses) == (0, 2)  # scatter -> 经纬度、经纬度 -> continuous 各一个条目
+    first_path = main.state_store.snapshot().path.path_points
+
+    second = main.load_test_path(3.0)
+    assert (stats.hits, stats.misses) == (2, 2)
+    assert [(p.latitude, p.longitude) for p in second] == [(p.latitude, p.longitude) for p in first]
+    assert main.state_store.snapshot().path.path_points == first_path
+
+    # 与不使用缓存的换算结果一致
+    uncached = GeoConverter(RectangularTaskArea())
+    latlon = np.array([(p.latitude, p.longitude) for p in second])
+    assert np.array_equal(latlon, uncached.meters_to_latlon_scatter_array(
+        main.record_physical_positions(*_episode(), main.PIXEL_SCALE)))
+
+
+def test_set_task_area_clears_cache():
+    converter = GeoConverter(RectangularTaskArea(), cache_size=16)
+    meters = np.array([[100.0, 200.0], [300.0, 400.0]])
+    converter.meters_to_latlon_continuous_array(meters)
+    converter.meters_to_latlon_continuous(100.0, 200.0)
+    assert len(converter.cache) == 2
+
+    converter.set_task_area(_ShiftedTaskArea())
+    assert len(converter.cache) == 0
+    assert converter.cache.stats.invalidations == 1
+
+    result = converter.meters_to_latlon_continuous_array(meters)
+    assert converter.cache.stats.hits == 0 and converter.cache.stats.misses == 3
+    assert np.array_equal(result, GeoConverter(_ShiftedTaskArea()).meters_to_latlon_continuous_array(meters))
+
+
+def _episode():
+    content = main.Reader(main.os.path.join('.', 'log', 'metrics_20250409_1634', 'metrics.json')).read()
+    return content['actions'], content['pos_list']
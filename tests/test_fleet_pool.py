@@ -0,0 +1,54 @@
+from geopy import Point
+from los import fleet_pool
+from los.fleet_pool import ShardedFleetController, _CMD_ASSIGN
+from message.boat_struct import BoatMessage
+
+
+class _RecordingConnection:
+    # 记录主进程经该连接下发的命令
+    def __init__(self, conn):
+        self._conn = conn
+        self.sent = []
+
+    def send(self, item):
+        self.sent.append(item)
+        self._conn.send(item)
+
+    def __getattr__(self, name):
+        return getattr(self._conn, name)
+
+
+def _boat(usv_id, latitude):
+    return BoatMessage(usv_id=usv_id, latitude=latitude, longitude=122.750, heading_angle=45.0, forward_speed=3.0)
+
+
+def test_assign_after_worker_crash_rebuilds_controller_once(monkeypatch):
+    path = [Point(latitude=30.800 + 0.001 * i, longitude=122.750 + 0.001 * i) for i in range(5)]
+    fleet = ShardedFleetController(1).start()
+    try:
+        fleet.assign_path(1, path, _boat(1, 30.7990))
+        assert len(fleet.tick({1: _boat(1, 30.7990)})) == 1
+
+        process = fleet._processes[0]
+        process.kill()
+        process.join(5.0)
+
+        start_shard = fleet._start_shard
+        started = []
+
+        def recording_start_shard(index):
+            conn, new_process = start_shard(index)
+            started.append(_RecordingConnection(conn))
+            return started[-1], new_process
+
+        monkeypatch.setattr(fleet, '_start_shard', recording_start_shard)
+        new_ins = _boat(1, 30.7995)
+        fleet.assign_path(1, path[1:], new_ins)
+
+        assert fleet.stats[0].restarts == 1
+        assigns = [payload for command, payload in started[0].sent if command == _CMD_ASSIGN]
+        assert assigns == [(1, [(p.latitude, p.longitude) for p in path[1:]], fleet_pool._compact_update(new_ins))]
+        assert fleet._sent[1] is new_ins
+        assert len(fleet.tick({1: new_ins})) == 1
+    finally:
+        fleet.stop(5.0)
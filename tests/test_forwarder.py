@@ -0,0 +1,40 @@
+import time
+from message.forwarder import Forwarder, ACK_WAITING, ACK_FAILED
+
+
+class _RecordingClient:
+    server_address = ('127.0.0.1', 4001)
+
+    def __init__(self):
+        self.sent = []
+
+    def send(self, message, printf=False):
+        self.sent.append(message)
+
+
+def _wait_for(condition, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "等待超时"
+        time.sleep(0.005)
+
+
+def test_failed_reliable_message_is_rearmed_on_resubmit():
+    client = _RecordingClient()
+    forwarder = Forwarder().start()
+    try:
+        forwarder.submit_reliable(client, 'flag', timeout=0.01, max_retries=1)
+        _wait_for(lambda: forwarder.reliable_state(client, str) == ACK_FAILED)
+        assert len(client.sent) == 2  # 首次发送 + 1 次重发
+
+        # 相同 version 再次提交：重新开始发送流程
+        forwarder.submit_reliable(client, 'flag', timeout=10.0, max_retries=1)
+        assert forwarder.reliable_state(client, str) == ACK_WAITING
+        _wait_for(lambda: len(client.sent) == 3)
+
+        # 等待应答期间再次提交：不重复发送
+        forwarder.submit_reliable(client, 'flag', timeout=10.0, max_retries=1)
+        time.sleep(0.05)
+        assert len(client.sent) == 3
+    finally:
+        forwarder.stop(1.0)
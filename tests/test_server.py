@@ -0,0 +1,22 @@
+import time
+import socket
+from message.server import UDPServer
+
+
+def test_receive_batch_skips_empty_datagram():
+    server = UDPServer(host='127.0.0.1', port=0, recv_buffer_size=None, batch_size=8)
+    address = server.server_socket.getsockname()
+    client = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    try:
+        client.sendto(b'', address)
+        client.sendto(b'[10,1,0]', address)
+        time.sleep(0.05)  # 两个数据报都已到达接收缓冲区，一次取出
+        batch = server.receive_batch(timeout=1.0)
+    finally:
+        client.close()
+        server.server_socket.close()
+
+    assert server.stats.empty == 1
+    assert [bytes(data) for data, _ in batch] == [b'[10,1,0]']
+    (messages, header), = server.parse_batch(batch)
+    assert header == 10 and messages[0].visual_flag == 1